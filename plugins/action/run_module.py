@@ -0,0 +1,104 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import re
+import sys
+from importlib import import_module
+from traceback import format_exc
+from ansible.errors import AnsibleError
+from ansible.module_utils import basic
+from ansible.module_utils._text import to_bytes
+from ansible.module_utils.six import StringIO
+from ansible.plugins.action import ActionBase
+
+from ansible_collections.pureport.pureport.plugins.module_utils.pureport import enable_client_reuse
+from ansible_collections.pureport.pureport.plugins.module_utils.pureport_crud import invalidate_item_indexes
+
+try:
+    from ansible.module_utils.common import warnings
+except ImportError:
+    warnings = None
+
+# The package of this collection's modules
+_MODULES_PACKAGE = 'ansible_collections.pureport.pureport.plugins.modules'
+_MODULE_NAME = re.compile(r'^[a-z0-9_]+$')
+
+
+def _reset_warnings():
+    """
+    Clear the warnings and deprecations collected by a previous module, as
+    they are collected globally for the lifetime of the process
+    """
+    if warnings is None:
+        return
+    for name in ('_global_warnings', '_global_deprecations'):
+        collected = getattr(warnings, name, None)
+        if isinstance(collected, list):
+            del collected[:]
+
+
+def _run_module_main(module_name, module_args):
+    """
+    Run a module's main in-process, the same way Ansible runs a module.  The
+    listings of a previous module are invalidated, as they may have been retrieved
+    by another account, or changed since.
+    :param str module_name: the name of the module
+    :param dict module_args: the arguments of the module, including Ansible's internal arguments
+    :returns: the printed result of the module
+    :rtype: str
+    """
+    module = import_module('%s.%s' % (_MODULES_PACKAGE, module_name))
+    _reset_warnings()
+    invalidate_item_indexes()
+    stdout = sys.stdout
+    sys.stdout = StringIO()
+    basic._ANSIBLE_ARGS = to_bytes(json.dumps(dict(ANSIBLE_MODULE_ARGS=module_args)))
+    try:
+        module.main()
+    except SystemExit:
+        pass
+    finally:
+        output = sys.stdout.getvalue()
+        sys.stdout = stdout
+        basic._ANSIBLE_ARGS = None
+    return output
+
+
+class ActionModule(ActionBase):
+    TRANSFERS_FILES = False
+    _VALID_ARGS = frozenset(('module', 'args'))
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        module_name = self._task.args.get('module')
+        if module_name is None or not _MODULE_NAME.match(module_name) or module_name == 'run_module':
+            raise AnsibleError("run_module requires the 'module' name of one of the Pureport modules.")
+        module_args = dict(self._task.args.get('args') or dict())
+        module_args.update(dict(
+            _ansible_module_name=module_name,
+            _ansible_check_mode=self._play_context.check_mode,
+            _ansible_diff=self._play_context.diff,
+            _ansible_no_log=self._play_context.no_log,
+            _ansible_verbosity=self._display.verbosity,
+            _ansible_debug=False
+        ))
+
+        enable_client_reuse()
+        try:
+            output = _run_module_main(module_name, module_args)
+        except ImportError as e:
+            raise AnsibleError("run_module could not import the Pureport module '%s': %s" % (module_name, e))
+        except Exception as e:
+            result.update(dict(failed=True, msg="The Pureport module '%s' failed: %s" % (module_name, e),
+                               exception=format_exc()))
+            return result
+
+        try:
+            result.update(json.loads(output.strip()))
+        except ValueError:
+            result.update(dict(failed=True, msg="The Pureport module '%s' returned an invalid result." % module_name,
+                               module_stdout=output))
+        return result
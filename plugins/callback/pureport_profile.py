@@ -0,0 +1,157 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+    callback: pureport_profile
+    type: aggregate
+    short_description: Profile the Pureport API requests of a playbook run
+    version_added: "2.9"
+    description:
+        - "Aggregate the 'pureport_metrics' returned by the Pureport modules when 'api_metrics' is enabled, and at
+          the end of the run, display the number of API requests, their total latency, the number of logins and
+          the response cache hit rate per role and task, followed by the slowest API endpoints."
+        - "Enable 'api_metrics' for the Pureport modules of a play with 'module_defaults', or per task."
+    requirements:
+      - enable in configuration, e.g callback_whitelist = pureport.pureport.pureport_profile
+    options:
+      endpoint_limit:
+        description: The number of slowest endpoints to display.
+        default: 10
+        type: int
+        env:
+          - name: PUREPORT_PROFILE_ENDPOINT_LIMIT
+        ini:
+          - section: callback_pureport_profile
+            key: endpoint_limit
+'''
+
+import re
+from collections import OrderedDict
+from ansible.plugins.callback import CallbackBase
+from ansible_collections.pureport.pureport.plugins.module_utils.pureport_metrics import METRICS_RESULT_KEY
+
+# The path segments which are ids, either numeric, UUIDs or the API's prefixed
+# ids (e.g network-XXXXXXXX or us-sea), as the API's own path segments are
+# never hyphenated
+_ID_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F]{8}(-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}|[A-Za-z0-9]+(-\w+)+)$')
+
+
+def _get_endpoint(request):
+    """
+    Get the endpoint of a recorded request, which is its method and its path
+    with the ids replaced (e.g GET /networks/{id}/connections)
+    :param dict request: the recorded request
+    :rtype: str
+    """
+    segments = request['path'].strip('/').split('/')
+    return '%s /%s' % (request['method'], '/'.join('{id}' if _ID_SEGMENT.match(segment) else segment
+                                                   for segment in segments))
+
+
+def _get_results(result):
+    """
+    Get the results of a task result, which for loops are the results of each item
+    :param dict result: the task result
+    :rtype: list[dict]
+    """
+    if isinstance(result.get('results'), list):
+        return [item_result for item_result in result['results'] if isinstance(item_result, dict)]
+    return [result]
+
+
+class _Profile(object):
+    def __init__(self):
+        """
+        The aggregated API requests of a task or endpoint
+        """
+        self.count = 0
+        self.elapsed = 0.0
+        self.max_elapsed = 0.0
+        self.logins = 0
+        self.gets = 0
+        self.cache_hits = 0
+
+    def add(self, request):
+        """
+        Add a recorded request
+        :param dict request: the recorded request
+        """
+        self.count += 1
+        self.elapsed += request['elapsed']
+        self.max_elapsed = max(self.max_elapsed, request['elapsed'])
+        if request['path'].endswith('/login'):
+            self.logins += 1
+        if request['method'] == 'GET':
+            self.gets += 1
+            if request.get('cached'):
+                self.cache_hits += 1
+
+    @property
+    def cache_hit_rate(self):
+        """
+        The percentage of GET requests served from the response cache
+        :rtype: str
+        """
+        return '%d%%' % (100 * self.cache_hits // self.gets) if self.gets > 0 else '-'
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'pureport.pureport.pureport_profile'
+    CALLBACK_NEEDS_WHITELIST = True
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, display=None):
+        super(CallbackModule, self).__init__(display=display)
+        self.__tasks = OrderedDict()
+        self.__endpoints = dict()
+
+    def __record(self, result):
+        task = result._task
+        role = task._role.get_name() if task._role is not None else '-'
+        for task_result in _get_results(result._result):
+            metrics = task_result.get(METRICS_RESULT_KEY)
+            if not isinstance(metrics, dict):
+                continue
+            task_profile = self.__tasks.setdefault((role, task.get_name()), _Profile())
+            for request in metrics.get('requests', []):
+                task_profile.add(request)
+                self.__endpoints.setdefault(_get_endpoint(request), _Profile()).add(request)
+
+    def v2_runner_on_ok(self, result):
+        self.__record(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self.__record(result)
+
+    def v2_playbook_on_stats(self, stats):
+        if len(self.__tasks) == 0:
+            return
+        self._display.banner('PUREPORT API PROFILE')
+        rows = [('Role', 'Task', 'Requests', 'Latency', 'Logins', 'Cache Hits')]
+        for (role, task), profile in self.__tasks.items():
+            rows.append((role, task, str(profile.count), '%.3fs' % profile.elapsed,
+                         str(profile.logins), profile.cache_hit_rate))
+        total = _Profile()
+        for profile in self.__tasks.values():
+            total.count += profile.count
+            total.elapsed += profile.elapsed
+            total.logins += profile.logins
+            total.gets += profile.gets
+            total.cache_hits += profile.cache_hits
+        rows.append(('', 'Total', str(total.count), '%.3fs' % total.elapsed, str(total.logins), total.cache_hit_rate))
+        self.__display_table(rows)
+
+        self._display.display('')
+        endpoint_limit = self.get_option('endpoint_limit')
+        endpoints = sorted(self.__endpoints.items(), key=lambda endpoint: endpoint[1].elapsed, reverse=True)
+        rows = [('Endpoint', 'Requests', 'Latency', 'Max Latency')]
+        for endpoint, profile in endpoints[:endpoint_limit]:
+            rows.append((endpoint, str(profile.count), '%.3fs' % profile.elapsed, '%.3fs' % profile.max_elapsed))
+        self.__display_table(rows)
+
+    def __display_table(self, rows):
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        for row in rows:
+            self._display.display('  '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
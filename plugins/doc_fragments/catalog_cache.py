@@ -0,0 +1,18 @@
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+options:
+    cache_ttl:
+        description:
+            - The number of seconds a response is cached on disk and reused by subsequent invocations
+            - with the same 'api_base_url' and params.  Responses are stored per user in ~/.cache/pureport,
+            - or the PUREPORT_CACHE_DIR environment variable.  Set to 0 to disable the cache.
+        required: false
+        type: int
+        default: 3600
+    force_refresh:
+        description:
+            - Ignore any cached response, retrieving it from the API and caching it again.
+        required: false
+        type: bool
+        default: false
+    '''
@@ -24,4 +24,57 @@ options:
             - the `pureport_access_token_fact` module.
             - Users should provide either the 'api_key' and 'api_secret' or the obtained 'api_access_token'.
         type: str
+    api_token_cache:
+        description:
+            - When using an 'api_key' and 'api_secret', cache the obtained access token on disk
+            - and reuse it for subsequent module invocations until shortly before it expires.
+            - Tokens are stored per user in ~/.cache/pureport, or the PUREPORT_CACHE_DIR environment variable.
+            - If the API rejects a cached token, such as after it was revoked, the module logs in again.
+        required: false
+        type: bool
+        default: true
+    api_connection_broker:
+        description:
+            - Route API requests through a local broker process, started on first use and listening on a
+            - Unix socket, which keeps pooled keep-alive connections to the 'api_base_url' open between
+            - module invocations.  This saves a TCP and TLS handshake per task.  The broker exits after
+            - 10 minutes without requests.  If the broker can not be started, or exits during a module,
+            - requests are sent directly.  Streamed listings are always sent directly.
+        required: false
+        type: bool
+        default: false
+    api_response_cache:
+        description:
+            - Cache the bodies of API responses which carry an ETag or Last-Modified validator on disk,
+            - and revalidate them with conditional requests.  When the API answers that a response is
+            - not modified, the cached body is used rather than downloading it again.  Responses are
+            - stored per user in ~/.cache/pureport, or the PUREPORT_CACHE_DIR environment variable.
+            - Streamed responses are not cached, and the least recently used responses are evicted
+            - once the cached responses exceed 64MB.
+        required: false
+        type: bool
+        default: false
+    api_metrics:
+        description:
+            - Record the method, path, status, size, latency and retries of every API request, including the login,
+            - and return them as 'pureport_metrics' in the module's result.
+        required: false
+        type: bool
+        default: false
+    api_metrics_file:
+        description:
+            - A file to which every recorded API request is appended as a line of JSON, along with the
+            - name of the module which sent it.  This implies 'api_metrics'.
+        required: false
+        type: path
+    api_retry_budget:
+        description:
+            - The number of seconds an API request may take, including its retries, or 0 to not retry.
+            - Throttled requests (429) are always retried, and idempotent requests which failed at a
+            - gateway (502, 503 and 504) are also retried, waiting a random, growing delay between
+            - attempts or the 'Retry-After' of the response.  A request is not retried once its next
+            - delay would exceed the budget.  The number of retries is returned as 'pureport_retries'.
+        required: false
+        type: int
+        default: 120
     '''
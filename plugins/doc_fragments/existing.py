@@ -0,0 +1,19 @@
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+options:
+    existing:
+        description:
+            - The registered result of a previous task for the same item.  Results are stamped with 'retrieved_at',
+              the time the item was retrieved from the server.  If the result is no older than 'existing_max_age',
+              it is used as the existing item rather than retrieving it again.
+            - The result must have the item's 'id', or, if an id was not provided, its 'name' and 'type', along with
+              the same account or network.
+        required: false
+        type: dict
+    existing_max_age:
+        description:
+            - The maximum age, in seconds, of an 'existing' result which is used without retrieving the item.
+        required: false
+        type: int
+        default: 60
+    '''
@@ -0,0 +1,38 @@
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+options:
+    filters:
+        description:
+            - Only return items matching all of these filters.  Each filter is a list of values, of which
+            - the item's value must be one.
+        required: false
+        type: dict
+        default: {}
+        suboptions:
+            name:
+                description:
+                    - A list of names.
+                type: list
+            state:
+                description:
+                    - A list of states (e.g ACTIVE).
+                type: list
+            type:
+                description:
+                    - A list of types (e.g AWS_DIRECT_CONNECT).
+                type: list
+            location_href:
+                description:
+                    - A list of location hrefs (e.g /locations/abc).
+                type: list
+            speed:
+                description:
+                    - A list of speeds (Mbps).
+                type: list
+    fields:
+        description:
+            - Only return these fields of each item (e.g ['id', 'href', 'name']).  By default, all fields are returned.
+        required: false
+        type: list
+        default: []
+    '''
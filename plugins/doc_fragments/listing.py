@@ -0,0 +1,10 @@
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+options:
+    max_items:
+        description:
+            - The maximum number of items to return.  The listing is streamed from the API, so no more
+              of it is retrieved than needed.  By default, all items are returned.
+        required: false
+        type: int
+    '''
@@ -0,0 +1,12 @@
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+options:
+    partial_update:
+        description:
+            - When updating an existing item, send only the top level fields which changed using a PATCH,
+            - rather than replacing the whole item.  If the API does not support a PATCH for the item,
+            - the whole item is updated instead.
+        required: false
+        type: bool
+        default: false
+    '''
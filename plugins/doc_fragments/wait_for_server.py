@@ -5,6 +5,9 @@ options:
         description:
             - These create/update/delete calls are typically async.  If you wish to wait until the
             - server has completed it's task, set this to True.
+            - If set to 'async', the module returns immediately along with a 'job' token, which can be
+            - checked later, without blocking, using the 'connection_status' module.
         required: false
-        type: bool
+        type: raw
+        default: false
     '''
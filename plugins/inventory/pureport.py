@@ -0,0 +1,177 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+    name: pureport
+    plugin_type: inventory
+    short_description: Pureport connections as an inventory source
+    version_added: "2.9"
+    requirements: [ pureport-client ]
+    author: Matt Traynham (@mtraynham)
+    description:
+        - "Get the connections of Pureport accounts as inventory hosts, named by their connection id.  Accounts,
+          their networks and their connections are listed concurrently using a bounded pool of workers."
+        - "Hosts are grouped by their network (network_<name>), location (location_<id>) and connection
+          type (type_<type>), and have the snake case connection, network and account as the
+          pureport_connection, pureport_network and pureport_account variables."
+        - "Uses a YAML configuration file that ends with pureport.yml or pureport.yaml.  Enable the inventory
+          cache to reuse the listings between refreshes."
+    extends_documentation_fragment:
+        - inventory_cache
+    options:
+        plugin:
+            description: The name of this plugin, it should always be set to 'pureport.pureport.pureport'.
+            required: true
+            choices: ['pureport.pureport.pureport']
+        api_base_url:
+            description: The host url for the Pureport API.
+            required: false
+            type: str
+            default: https://api.pureport.com
+            env:
+                - name: PUREPORT_API_BASE_URL
+        api_key:
+            description: The pre-configured API Key for a Pureport Account.
+            required: false
+            type: str
+            env:
+                - name: PUREPORT_API_KEY
+        api_secret:
+            description: The pre-configured API Secret for a Pureport Account.
+            required: false
+            type: str
+            env:
+                - name: PUREPORT_API_SECRET
+        api_access_token:
+            description: The access token to use with Pureport API, rather than the 'api_key' and 'api_secret'.
+            required: false
+            type: str
+            env:
+                - name: PUREPORT_API_ACCESS_TOKEN
+        account_hrefs:
+            description: The hrefs of the accounts to get the connections of.  By default, every account is used.
+            required: false
+            type: list
+        parallelism:
+            description: The maximum number of listings retrieved concurrently.
+            required: false
+            type: int
+            default: 10
+'''
+
+EXAMPLES = '''
+# pureport.yml
+plugin: pureport.pureport.pureport
+api_key: XXXXXXXXXXXXX
+api_secret: XXXXXXXXXXXXXXXXX
+account_hrefs:
+  - /accounts/ac-XXXXXXXXXXXXXXXXXXXXXX
+cache: true
+cache_plugin: jsonfile
+cache_connection: ~/.cache/pureport/inventory
+cache_timeout: 3600
+'''
+
+from multiprocessing.pool import ThreadPool
+from ansible.errors import AnsibleError
+from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable
+
+try:
+    from pureport.exception.api import ClientHttpException
+except ImportError:
+    ClientHttpException = None
+from ansible_collections.pureport.pureport.plugins.module_utils.pureport import \
+    HAS_PUREPORT_CLIENT, \
+    create_client
+
+
+class InventoryModule(BaseInventoryPlugin, Cacheable):
+    NAME = 'pureport.pureport.pureport'
+
+    def verify_file(self, path):
+        return super(InventoryModule, self).verify_file(path) and \
+            path.endswith(('pureport.yml', 'pureport.yaml'))
+
+    def __list_networks(self, client):
+        """
+        List the networks of the accounts, along with their connections
+        :param pureport.api.client.Client client: the Pureport client
+        :returns: a listing per network, with its account, the network and its connections
+        :rtype: list[dict]
+        """
+        account_hrefs = self.get_option('account_hrefs')
+        if account_hrefs is not None:
+            accounts = [dict(href=account_href) for account_href in account_hrefs]
+        else:
+            accounts = client.accounts.list()
+
+        pool = ThreadPool(max(1, self.get_option('parallelism')))
+        try:
+            networks = pool.map(lambda account: client.accounts.networks(account).list(), accounts)
+            listings = [dict(account=account, network=network)
+                        for account, account_networks in zip(accounts, networks)
+                        for network in account_networks]
+            connections = pool.map(lambda listing: client.networks.connections(listing['network']).list(), listings)
+        finally:
+            pool.close()
+            pool.join()
+        for listing, network_connections in zip(listings, connections):
+            listing['connections'] = network_connections
+        return listings
+
+    def __populate(self, listings):
+        """
+        Add the connections of the network listings to the inventory
+        :param list[dict] listings: the network listings
+        """
+        for listing in listings:
+            network = listing['network']
+            network_group = self.inventory.add_group(self._sanitize_group_name('network_%s' % network.get('name')))
+            for connection in listing['connections']:
+                host = self.inventory.add_host(connection['id'], group=network_group)
+                location = connection.get('location')
+                if location is not None and location.get('href') is not None:
+                    location_group = self.inventory.add_group(
+                        self._sanitize_group_name('location_%s' % location['href'].split('/')[-1])
+                    )
+                    self.inventory.add_child(location_group, host)
+                if connection.get('type') is not None:
+                    type_group = self.inventory.add_group(
+                        self._sanitize_group_name('type_%s' % connection['type'].lower())
+                    )
+                    self.inventory.add_child(type_group, host)
+                self.inventory.set_variable(host, 'pureport_connection', camel_dict_to_snake_dict(connection))
+                self.inventory.set_variable(host, 'pureport_network', camel_dict_to_snake_dict(network))
+                self.inventory.set_variable(host, 'pureport_account', camel_dict_to_snake_dict(listing['account']))
+
+    def parse(self, inventory, loader, path, cache=True):
+        super(InventoryModule, self).parse(inventory, loader, path)
+        self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        user_cache_setting = self.get_option('cache')
+        attempt_to_read_cache = user_cache_setting and cache
+        cache_needs_update = user_cache_setting and not cache
+
+        listings = None
+        if attempt_to_read_cache:
+            try:
+                listings = self._cache[cache_key]
+            except KeyError:
+                cache_needs_update = True
+        if listings is None:
+            if not HAS_PUREPORT_CLIENT:
+                raise AnsibleError('pureport-client required for this inventory plugin')
+            try:
+                client = create_client(self.get_option('api_base_url'),
+                                       api_key=self.get_option('api_key'),
+                                       api_secret=self.get_option('api_secret'),
+                                       access_token=self.get_option('api_access_token'))
+                listings = self.__list_networks(client)
+            except ClientHttpException as e:
+                raise AnsibleError('Failed to list the Pureport connections: %s' % e.response.text)
+        if cache_needs_update:
+            self._cache[cache_key] = listings
+
+        self.__populate(listings)
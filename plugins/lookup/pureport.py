@@ -0,0 +1,192 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+    lookup: pureport
+    short_description: Find Pureport objects, such as locations or cloud regions
+    version_added: "2.9"
+    requirements: [ pureport-client ]
+    author: Matt Traynham (@mtraynham)
+    description:
+        - "List Pureport objects on the controller and return those matching the keyword filters, in snake case.
+          String filters match values containing them, ignoring case, and other filters must be equal."
+        - "Ansible runs lookups in the process of each task, so results are only memoized within a task.  Across
+          tasks, catalog objects (locations, facilities, cloud_regions, cloud_services and options) are cached on
+          disk for 'cache_ttl' seconds, shared with the modules listing them, and access tokens are cached on disk
+          like the modules cache them, so later tasks do not log in again.  Accounts, networks and connections are
+          listed again by each task, so they reflect the changes of earlier tasks."
+    options:
+        _terms:
+            description: The type of objects to find, one of locations, facilities, cloud_regions, cloud_services,
+                options, accounts, networks or connections.
+            required: true
+        api_base_url:
+            description: The host url for the Pureport API.
+            type: str
+            default: https://api.pureport.com
+            env:
+                - name: PUREPORT_API_BASE_URL
+        api_key:
+            description: The pre-configured API Key for a Pureport Account.
+            type: str
+            env:
+                - name: PUREPORT_API_KEY
+        api_secret:
+            description: The pre-configured API Secret for a Pureport Account.
+            type: str
+            env:
+                - name: PUREPORT_API_SECRET
+        api_access_token:
+            description: The access token to use with Pureport API, rather than the 'api_key' and 'api_secret'.
+            type: str
+            env:
+                - name: PUREPORT_API_ACCESS_TOKEN
+        account_href:
+            description: The account of the networks to find.  Required for networks.
+            type: str
+        network_href:
+            description: The network of the connections to find.  Required for connections.
+            type: str
+        cache_ttl:
+            description: The number of seconds catalog objects are cached on disk for, or 0 to not cache them.
+            type: int
+            default: 3600
+'''
+
+EXAMPLES = '''
+- name: Find the Raleigh location
+  debug:
+    msg: "{{ lookup('pureport.pureport.pureport', 'locations', name='Raleigh',
+                    api_key=api_key, api_secret=api_secret) }}"
+
+- name: Create a connection in the Seattle location
+  site_ipsec_vpn_connection:
+    api_key: "{{ api_key }}"
+    api_secret: "{{ api_secret }}"
+    network_href: "{{ network_href }}"
+    location_href: "{{ query('pureport.pureport.pureport', 'locations', name='Seattle')[0].href }}"
+    ...
+'''
+
+RETURN = '''
+    _raw:
+        description: The matching objects, in snake case.
+        type: list
+'''
+
+from ansible.errors import AnsibleError
+from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
+from ansible.module_utils.six import string_types
+from ansible.plugins.lookup import LookupBase
+
+try:
+    from pureport.exception.api import ClientHttpException
+except ImportError:
+    ClientHttpException = None
+from ansible_collections.pureport.pureport.plugins.module_utils.pureport import \
+    HAS_PUREPORT_CLIENT, \
+    create_client
+from ansible_collections.pureport.pureport.plugins.module_utils.pureport_cache import \
+    get_cached_items
+
+# The options of the lookup, any other keyword is a filter
+_OPTIONS = ('api_base_url', 'api_key', 'api_secret', 'api_access_token', 'account_href', 'network_href', 'cache_ttl')
+# The catalog objects which are cached on disk, and how they are listed
+_CATALOGS = dict(
+    locations=lambda client: client.locations.list(),
+    facilities=lambda client: client.facilities.list(),
+    cloud_regions=lambda client: client.cloud_regions.list(),
+    cloud_services=lambda client: client.cloud_services.list(),
+    options=lambda client: client.options.list()
+)
+
+# The clients and the listed objects, memoized for the lifetime of the process,
+# which is a single task as Ansible runs lookups in each task's worker process
+_CLIENTS = dict()
+_LISTINGS = dict()
+
+
+def _matches(item, filters):
+    """
+    Check if an item matches the filters
+    :param dict item: the snake case item
+    :param dict filters: the filters
+    :rtype: bool
+    """
+    for key, value in filters.items():
+        item_value = item.get(key)
+        if isinstance(value, string_types) and isinstance(item_value, string_types):
+            if value.lower() not in item_value.lower():
+                return False
+        elif item_value != value:
+            return False
+    return True
+
+
+class LookupModule(LookupBase):
+    def __get_client(self):
+        key = (self.get_option('api_base_url'),
+               self.get_option('api_key'),
+               self.get_option('api_secret'),
+               self.get_option('api_access_token'))
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = create_client(self.get_option('api_base_url'),
+                                   api_key=self.get_option('api_key'),
+                                   api_secret=self.get_option('api_secret'),
+                                   access_token=self.get_option('api_access_token'))
+            _CLIENTS[key] = client
+        return client
+
+    def __list(self, term):
+        """
+        List the objects of a term
+        :param str term: the type of objects
+        :rtype: list[dict]
+        """
+        if term in _CATALOGS:
+            items = get_cached_items(self.get_option('api_base_url'),
+                                     term,
+                                     lambda: _CATALOGS[term](self.__get_client()),
+                                     cache_ttl=self.get_option('cache_ttl'))
+            # Options are returned as lists of options by their type
+            if isinstance(items, dict):
+                items = [dict(option, type=option_type)
+                         for option_type, options in items.items() for option in options]
+            return items
+        elif term == 'accounts':
+            return self.__get_client().accounts.list()
+        elif term == 'networks':
+            if self.get_option('account_href') is None:
+                raise AnsibleError("The pureport lookup requires an 'account_href' to find networks.")
+            return self.__get_client().accounts.networks(dict(href=self.get_option('account_href'))).list()
+        elif term == 'connections':
+            if self.get_option('network_href') is None:
+                raise AnsibleError("The pureport lookup requires a 'network_href' to find connections.")
+            return self.__get_client().networks.connections(dict(href=self.get_option('network_href'))).list()
+        raise AnsibleError("The pureport lookup can not find '%s', it must be one of %s" %
+                           (term, ', '.join(sorted(list(_CATALOGS.keys()) + ['accounts', 'networks', 'connections']))))
+
+    def run(self, terms, variables=None, **kwargs):
+        if not HAS_PUREPORT_CLIENT:
+            raise AnsibleError('pureport-client required for this lookup')
+        self.set_options(var_options=variables,
+                         direct=dict((key, value) for key, value in kwargs.items() if key in _OPTIONS))
+        filters = dict((key, value) for key, value in kwargs.items() if key not in _OPTIONS)
+
+        results = []
+        for term in terms:
+            key = (self.get_option('api_base_url'),
+                   self.get_option('api_key') or self.get_option('api_access_token'),
+                   term,
+                   self.get_option('account_href'),
+                   self.get_option('network_href'))
+            items = _LISTINGS.get(key)
+            if items is None:
+                try:
+                    items = [camel_dict_to_snake_dict(item) for item in self.__list(term)]
+                except ClientHttpException as e:
+                    raise AnsibleError('Failed to find the Pureport %s: %s' % (term, e.response.text))
+                _LISTINGS[key] = items
+            results.extend(item for item in items if _matches(item, filters))
+        return results
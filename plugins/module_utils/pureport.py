@@ -1,3 +1,5 @@
+from functools import partial
+from time import time
 from traceback import format_exc
 try:
     from pureport.api.client import Client, API_URL
@@ -7,6 +9,30 @@ except ImportError:
     HAS_PUREPORT_CLIENT = False
     Client = None
     ClientHttpException = None
+from .pureport_broker import get_broker_adapter
+from .pureport_metrics import install_api_metrics
+from .pureport_response_cache import get_response_cache_adapter
+from .pureport_retry import \
+    RETRY_BUDGET, \
+    RetryAdapter, \
+    get_retry_adapter, \
+    install_retry_counts
+from .pureport_cache import \
+    delete_cache_entry, \
+    get_cache_key, \
+    read_cache_entry, \
+    write_cache_entry
+
+# Cached access tokens are refreshed this many seconds before they expire, so
+# a token is never handed to a module which may outlive it (e.g. wait_for_server)
+TOKEN_EXPIRY_LEEWAY = 300
+# The API collections (e.g /connections), by base url, which rejected a PATCH
+__PATCH_UNSUPPORTED_COLLECTIONS = set()
+# The status codes with which the API rejects a PATCH it does not support
+PATCH_UNSUPPORTED_STATUS_CODES = (405, 501)
+# Logged in clients by their module params, which are only reused once enabled
+# by modules run in-process on the controller, such as by the run_module action
+__REUSED_CLIENTS = None
 
 
 def get_client_argument_spec():
@@ -18,7 +44,13 @@ def get_client_argument_spec():
         api_base_url=dict(type='str', default=API_URL),
         api_key=dict(type='str'),
         api_secret=dict(type='str', no_log=True),
-        api_access_token=dict(type='str', no_log=True)
+        api_access_token=dict(type='str', no_log=True),
+        api_token_cache=dict(type='bool', default=True),
+        api_connection_broker=dict(type='bool', default=False),
+        api_response_cache=dict(type='bool', default=False),
+        api_metrics=dict(type='bool', default=False),
+        api_metrics_file=dict(type='path'),
+        api_retry_budget=dict(type='int', default=RETRY_BUDGET)
     )
 
 
@@ -33,24 +65,214 @@ def get_client_mutually_exclusive():
     ]
 
 
+def get_client_session(client):
+    """
+    Get the underlying requests session of a Pureport Client.  The client does
+    not expose its session, so this reaches through the name mangled attribute.
+    :param Client client: the Pureport client
+    :rtype: pureport.util.api.PureportSession
+    """
+    return getattr(client, '_Client__session')
+
+
+def __get_token_cache_entry_name(api_base_url, api_key, api_secret):
+    """
+    Get the token cache entry name for an API key.  The secret is part of the
+    key so a cached token is never handed out for a mismatched secret.
+    :param str api_base_url: the Pureport API url
+    :param str api_key: the API key
+    :param str api_secret: the API secret
+    :rtype: str
+    """
+    return 'token-%s.json' % get_cache_key(api_base_url, api_key, api_secret)
+
+
+def __get_cached_access_token(entry_name):
+    """
+    Get a cached access token if one exists and is not about to expire
+    :param str entry_name: the token cache entry name
+    :rtype: str|None
+    """
+    entry = read_cache_entry(entry_name)
+    if entry is not None and entry.get('expires_at', 0) - TOKEN_EXPIRY_LEEWAY > time():
+        return entry.get('access_token')
+    return None
+
+
+def __set_cached_access_token(entry_name, client, access_token):
+    """
+    Store the access token obtained by the client's login in the token cache
+    :param str entry_name: the token cache entry name
+    :param Client client: the logged in Pureport client
+    :param str access_token: the access token
+    """
+    expires_at = getattr(get_client_session(client), '_token_expire_time', None)
+    if expires_at is not None:
+        write_cache_entry(entry_name, dict(access_token=access_token, expires_at=expires_at))
+
+
+def __get_relogin_hook(client, entry_name, api_key, api_secret):
+    """
+    Get a response hook which, when the API rejects a cached access token as
+    unauthorized, such as after it was revoked, drops it from the token cache,
+    logs in again with the API key and secret and resends the request.  This
+    is only done once, for the first rejected request.
+    :param Client client: the Pureport client
+    :param str entry_name: the token cache entry name
+    :param str api_key: the API key
+    :param str api_secret: the API secret
+    :rtype: (requests.Response, **kwargs) -> requests.Response|None
+    """
+    relogged_in = []
+
+    def relogin(response, *args, **kwargs):
+        if response.status_code != 401 or len(relogged_in) > 0:
+            return None
+        relogged_in.append(True)
+        delete_cache_entry(entry_name)
+        # Consume the body, releasing the connection
+        response.content
+        session = get_client_session(client)
+        access_token = client.login(key=api_key, secret=api_secret)
+        __set_cached_access_token(entry_name, client, access_token)
+        request = response.request.copy()
+        request.headers['Authorization'] = session.headers['Authorization']
+        return session.send(request, **kwargs)
+    return relogin
+
+
+def create_client(api_base_url,
+                  api_key=None,
+                  api_secret=None,
+                  access_token=None,
+                  token_cache=True,
+                  connection_broker=False,
+                  response_cache=False,
+                  retry_budget=RETRY_BUDGET,
+                  configure_session_fn=None):
+    """
+    Create a logged in Pureport Client instance, independent of any Ansible
+    module, so it can also be used by plugins.  When logging in with an API
+    key and secret, access tokens are cached on disk and reused by subsequent
+    invocations until shortly before they expire, or until the API rejects
+    them, after which the client logs in again.  Optionally, requests are
+    routed through a local broker process which keeps pooled connections to
+    the API open across invocations, and responses are cached on disk and
+    revalidated with conditional requests.  Throttled requests, and idempotent
+    requests which failed at a gateway, are retried within the retry budget.
+    :param str api_base_url: the Pureport API url
+    :param str api_key: the API key
+    :param str api_secret: the API secret
+    :param str access_token: an access token, used instead of the API key and secret
+    :param bool token_cache: cache the access token obtained with the API key and secret
+    :param bool connection_broker: route requests through the local broker
+    :param bool response_cache: cache responses on disk
+    :param int retry_budget: the seconds a request may take, including its retries, or 0 to not retry
+    :param (pureport.util.api.PureportSession) -> None configure_session_fn:
+        A function which further configures the client's session before logging in
+    :rtype: Client
+    :raises: pureport.exception.api.ClientHttpException
+    """
+    token_cache_entry_name = None
+    cached_access_token = None
+    if token_cache and \
+            access_token is None and \
+            api_key is not None and \
+            api_secret is not None:
+        token_cache_entry_name = __get_token_cache_entry_name(api_base_url, api_key, api_secret)
+        cached_access_token = __get_cached_access_token(token_cache_entry_name)
+        access_token = cached_access_token
+
+    client = Client(api_base_url)
+    session = get_client_session(client)
+    if connection_broker:
+        broker_adapter = get_broker_adapter(session.get_adapter(api_base_url))
+        if broker_adapter is not None:
+            session.mount(api_base_url, broker_adapter)
+    if response_cache:
+        response_cache_adapter = get_response_cache_adapter(session.get_adapter(api_base_url),
+                                                            api_key if api_key is not None else access_token)
+        if response_cache_adapter is not None:
+            session.mount(api_base_url, response_cache_adapter)
+    if retry_budget > 0:
+        retry_adapter = get_retry_adapter(session.get_adapter(api_base_url), retry_budget)
+        if retry_adapter is not None:
+            session.mount(api_base_url, retry_adapter)
+    if configure_session_fn is not None:
+        configure_session_fn(session)
+    if cached_access_token is not None:
+        # Added last, so the other hooks only see the resent request once
+        session.hooks['response'].append(__get_relogin_hook(client, token_cache_entry_name, api_key, api_secret))
+    if access_token is not None:
+        client.login(access_token=access_token)
+    else:
+        access_token = client.login(key=api_key, secret=api_secret)
+        if token_cache_entry_name is not None:
+            __set_cached_access_token(token_cache_entry_name, client, access_token)
+    return client
+
+
+def __install_retry_counts(module, client):
+    """
+    Report the retries of a client's requests during the module in its result
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :param Client client: the Pureport client
+    :returns: the client
+    :rtype: Client
+    """
+    adapter = get_client_session(client).get_adapter(module.params.get('api_base_url'))
+    if isinstance(adapter, RetryAdapter):
+        install_retry_counts(module, adapter.policy)
+    return client
+
+
+def enable_client_reuse():
+    """
+    Reuse logged in clients, along with their pooled connections, for every
+    module with the same client params for the rest of the process.  This is
+    only meant for modules run in-process, one after another, on the controller.
+    """
+    global __REUSED_CLIENTS
+    if __REUSED_CLIENTS is None:
+        __REUSED_CLIENTS = dict()
+
+
 def get_client(module):
     """
-    Get a Pureport Client instance
+    Get a Pureport Client instance for an Ansible module, created as
+    create_client does from the module's params.  The number of retried
+    requests, and optionally every request, is recorded in the module's result.
     :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
     :rtype: Client
     """
     if not HAS_PUREPORT_CLIENT:
         module.fail_json(msg='pureport-client required for this module')
-    client = Client(module.params.get('api_base_url'))
+    configure_session_fn = None
+    if module.params.get('api_metrics') or module.params.get('api_metrics_file') is not None:
+        configure_session_fn = partial(install_api_metrics, module)
+
+    # Clients recording metrics are never reused, as their requests are
+    # recorded for a single module
+    reuse_key = None
+    if __REUSED_CLIENTS is not None and configure_session_fn is None:
+        reuse_key = tuple(module.params.get(name) for name in sorted(get_client_argument_spec().keys()))
+        if reuse_key in __REUSED_CLIENTS:
+            return __install_retry_counts(module, __REUSED_CLIENTS[reuse_key])
     try:
-        client.login(
-            key=module.params.get('api_key'),
-            secret=module.params.get('api_secret'),
-            access_token=module.params.get('api_access_token')
-        )
+        client = create_client(module.params.get('api_base_url'),
+                               api_key=module.params.get('api_key'),
+                               api_secret=module.params.get('api_secret'),
+                               access_token=module.params.get('api_access_token'),
+                               token_cache=module.params.get('api_token_cache'),
+                               connection_broker=module.params.get('api_connection_broker'),
+                               response_cache=module.params.get('api_response_cache'),
+                               retry_budget=module.params.get('api_retry_budget'),
+                               configure_session_fn=configure_session_fn)
     except ClientHttpException as e:
         module.fail_json(msg=e.response.text, exception=format_exc())
-    return client
+    if reuse_key is not None:
+        __REUSED_CLIENTS[reuse_key] = client
+    return __install_retry_counts(module, client)
 
 
 def get_account_argument_spec(required=False):
@@ -93,3 +315,29 @@ def get_network(module):
     """
     network_href = module.params.get('network_href')
     return dict(href=network_href) if network_href is not None else None
+
+
+def patch_item(client, item, patch):
+    """
+    Partially update an item, sending only the patched fields with a PATCH.
+    If the API rejects the PATCH as unsupported for the item's collection,
+    None is returned so the caller can fall back to a full update, and the
+    collection is not patched again by this process.
+    :param Client client: the Pureport client
+    :param dict item: the item, which must have an href
+    :param dict patch: the fields to update
+    :returns: the updated item or None if PATCH is not supported
+    :rtype: dict|None
+    :raises: pureport.exception.api.ClientHttpException
+    """
+    session = get_client_session(client)
+    collection = (getattr(session, '_base_url', None), item['href'].split('/')[1])
+    if collection in __PATCH_UNSUPPORTED_COLLECTIONS:
+        return None
+    try:
+        return session.patch(item['href'], json=patch).json()
+    except ClientHttpException as e:
+        if e.response.status_code in PATCH_UNSUPPORTED_STATUS_CODES:
+            __PATCH_UNSUPPORTED_COLLECTIONS.add(collection)
+            return None
+        raise
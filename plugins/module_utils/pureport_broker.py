@@ -0,0 +1,316 @@
+import json
+import os
+import socket
+import struct
+import threading
+from base64 import b64decode, b64encode
+from time import sleep, time
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+try:
+    from requests import Session
+    from requests.adapters import BaseAdapter, HTTPAdapter
+    from requests.exceptions import ConnectionError
+    from requests.models import Response
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+    BaseAdapter = object
+from .pureport_cache import get_cache_dir
+
+# The broker exits once it has not served a request for this many seconds
+BROKER_IDLE_TIMEOUT = 600
+# How long a module waits for a newly spawned broker to start listening
+BROKER_START_TIMEOUT = 5
+# Requests which may be sent again when the broker failed before replying,
+# as the API may have processed them
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+_MESSAGE_HEADER = struct.Struct('!I')
+
+
+def get_broker_socket_path():
+    """
+    Get the path of the broker's Unix socket
+    :rtype: str
+    """
+    return os.path.join(get_cache_dir(), 'broker.sock')
+
+
+def _send_message(sock, message):
+    """
+    Send a length prefixed JSON message over the socket
+    :param socket.socket sock: the socket
+    :param dict message: the message
+    """
+    data = json.dumps(message).encode('utf-8')
+    sock.sendall(_MESSAGE_HEADER.pack(len(data)) + data)
+
+
+def _receive_exactly(sock, size):
+    """
+    Receive exactly size bytes from the socket
+    :param socket.socket sock: the socket
+    :param int size: the number of bytes to receive
+    :rtype: bytes
+    :raises: EOFError if the socket was closed
+    """
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            raise EOFError()
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _receive_message(sock):
+    """
+    Receive a length prefixed JSON message from the socket
+    :param socket.socket sock: the socket
+    :rtype: dict
+    :raises: EOFError if the socket was closed
+    """
+    size, = _MESSAGE_HEADER.unpack(_receive_exactly(sock, _MESSAGE_HEADER.size))
+    return json.loads(_receive_exactly(sock, size).decode('utf-8'))
+
+
+def _encode_body(body):
+    """
+    Encode a request or response body for a message
+    :param str|bytes|None body: the body
+    :rtype: str|None
+    """
+    if body is None:
+        return None
+    if not isinstance(body, bytes):
+        body = body.encode('utf-8')
+    return b64encode(body).decode('ascii')
+
+
+def _decode_body(body):
+    """
+    Decode a request or response body from a message
+    :param str|None body: the encoded body
+    :rtype: bytes|None
+    """
+    return b64decode(body) if body is not None else None
+
+
+def _handle_requests(adapter, sock):
+    """
+    Serve requests from a single module over its socket until it disconnects.
+    Each module gets its own session, so cookies are never shared between
+    modules, which may use other credentials, while the pooled connections of
+    the adapter are.  The module's own cookies are sent in its headers.
+    :param requests.adapters.HTTPAdapter adapter: the shared, pooled adapter
+    :param socket.socket sock: the module's socket
+    """
+    session = Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    try:
+        while True:
+            try:
+                message = _receive_message(sock)
+            except EOFError:
+                return
+            timeout = message.get('timeout')
+            try:
+                response = session.request(
+                    message['method'],
+                    message['url'],
+                    headers=message['headers'],
+                    data=_decode_body(message.get('body')),
+                    timeout=tuple(timeout) if isinstance(timeout, list) else timeout,
+                    verify=message.get('verify', True),
+                    allow_redirects=False
+                )
+                reply = dict(
+                    status=response.status_code,
+                    reason=response.reason,
+                    headers=dict(response.headers),
+                    body=_encode_body(response.content)
+                )
+            except Exception as e:
+                reply = dict(error=str(e))
+            _send_message(sock, reply)
+    except (IOError, OSError):
+        pass
+    finally:
+        sock.close()
+
+
+def _serve(socket_path, idle_timeout):
+    """
+    Run the broker, serving requests for modules over a Unix socket with a
+    single pooled keep-alive session until it is idle for idle_timeout seconds.
+    :param str socket_path: the path of the Unix socket
+    :param int idle_timeout: the idle timeout in seconds
+    """
+    # Only a single broker should ever own the socket
+    lock_file = open(socket_path + '.lock', 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except (IOError, OSError):
+        return
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    adapter = HTTPAdapter()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    os.chmod(socket_path, 0o600)
+    server.listen(32)
+    server.settimeout(idle_timeout)
+    handlers = []
+    try:
+        while True:
+            try:
+                sock, _ = server.accept()
+            except socket.timeout:
+                handlers = [handler for handler in handlers if handler.is_alive()]
+                if len(handlers) == 0:
+                    return
+                continue
+            sock.settimeout(None)
+            handler = threading.Thread(target=_handle_requests, args=(adapter, sock))
+            handler.daemon = True
+            handler.start()
+            handlers.append(handler)
+    finally:
+        server.close()
+        os.remove(socket_path)
+        adapter.close()
+
+
+def _spawn_broker(socket_path):
+    """
+    Spawn the broker as a detached daemon process.  The daemon must not hold
+    on to the module's stdio, otherwise Ansible would wait on it to exit.
+    :param str socket_path: the path of the Unix socket
+    """
+    pid = os.fork()
+    if pid != 0:
+        os.waitpid(pid, 0)
+        return
+    try:
+        os.setsid()
+        if os.fork() != 0:
+            os._exit(0)
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        os.closerange(3, devnull)
+        os.closerange(devnull + 1, 1024)
+        _serve(socket_path, BROKER_IDLE_TIMEOUT)
+    finally:
+        os._exit(0)
+
+
+def _connect(socket_path):
+    """
+    Connect to the broker
+    :param str socket_path: the path of the Unix socket
+    :returns: the connected socket or None if the broker is not running
+    :rtype: socket.socket|None
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        return sock
+    except (IOError, OSError):
+        sock.close()
+        return None
+
+
+class BrokerAdapter(BaseAdapter):
+    def __init__(self, sock, adapter):
+        """
+        A :class:`requests.adapters.BaseAdapter` which sends requests through
+        the local broker, which keeps pooled keep-alive sessions to the API.
+        Streamed requests are sent directly with the wrapped adapter, as the
+        broker reads whole bodies, and once the broker's socket fails, every
+        request is.  A request the broker may have already sent to the API is
+        only sent again if it is idempotent.
+        :param socket.socket sock: a socket connected to the broker
+        :param requests.adapters.BaseAdapter adapter: the adapter which sends requests directly
+        """
+        super(BrokerAdapter, self).__init__()
+        self.__socket = sock
+        self.__adapter = adapter
+        self.__broken = False
+        self.__lock = threading.Lock()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if stream or self.__broken:
+            return self.__adapter.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert,
+                                       proxies=proxies)
+        message = dict(
+            method=request.method,
+            url=request.url,
+            headers=dict(request.headers),
+            body=_encode_body(request.body),
+            timeout=timeout,
+            verify=verify
+        )
+        sent = False
+        try:
+            with self.__lock:
+                _send_message(self.__socket, message)
+                sent = True
+                reply = _receive_message(self.__socket)
+        except (IOError, OSError, EOFError) as e:
+            # The broker exited, so fall back to sending requests directly
+            self.__broken = True
+            if sent and request.method not in IDEMPOTENT_METHODS:
+                raise ConnectionError(e, request=request)
+            return self.__adapter.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert,
+                                       proxies=proxies)
+        if 'error' in reply:
+            raise ConnectionError(reply['error'], request=request)
+
+        response = Response()
+        response.status_code = reply['status']
+        response.reason = reply['reason']
+        response.headers = CaseInsensitiveDict(reply['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response._content = _decode_body(reply['body'])
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        self.__socket.close()
+        self.__adapter.close()
+
+
+def get_broker_adapter(adapter):
+    """
+    Get an adapter which routes requests through the local broker, starting
+    the broker if it is not already running.
+    :param requests.adapters.BaseAdapter adapter: the adapter which sends requests directly
+    :returns: the adapter or None if the broker is not available on this host
+    :rtype: BrokerAdapter|None
+    """
+    if not HAS_REQUESTS or not HAS_FCNTL or not hasattr(socket, 'AF_UNIX'):
+        return None
+    try:
+        socket_path = get_broker_socket_path()
+    except (IOError, OSError):
+        return None
+    sock = _connect(socket_path)
+    if sock is None:
+        _spawn_broker(socket_path)
+        deadline = time() + BROKER_START_TIMEOUT
+        while sock is None and time() < deadline:
+            sleep(0.05)
+            sock = _connect(socket_path)
+    return BrokerAdapter(sock, adapter) if sock is not None else None
@@ -0,0 +1,160 @@
+import json
+import os
+from hashlib import sha256
+from tempfile import mkstemp
+from time import time
+
+# Catalog data (locations, cloud regions, etc.) rarely changes, so by default
+# it is cached for an hour
+CATALOG_CACHE_TTL = 3600
+
+
+def get_cache_dir():
+    """
+    Get the per-user directory used to store Pureport caches, creating it if
+    it does not exist.  This can be overridden with the PUREPORT_CACHE_DIR
+    environment variable.
+    :rtype: str
+    """
+    cache_dir = os.environ.get('PUREPORT_CACHE_DIR',
+                               os.path.join(os.path.expanduser('~'), '.cache', 'pureport'))
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir, 0o700)
+    return cache_dir
+
+
+def get_catalog_cache_argument_spec():
+    """
+    Return the basic catalog cache params
+    :rtype: dict[str, dict]
+    """
+    return dict(
+        cache_ttl=dict(type='int', default=CATALOG_CACHE_TTL),
+        force_refresh=dict(type='bool', default=False)
+    )
+
+
+def get_cache_key(*parts):
+    """
+    Get a stable cache key for the given parts, hashed so secrets or urls
+    are never written as file names.
+    :param parts: the parts which uniquely identify the cache entry
+    :rtype: str
+    """
+    return sha256('\0'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def read_cache_entry(name):
+    """
+    Read a cache entry from disk
+    :param str name: the name of the cache entry
+    :returns: the entry or None if it does not exist or could not be read
+    :rtype: dict|None
+    """
+    try:
+        with open(os.path.join(get_cache_dir(), name), 'r') as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def write_cache_entry(name, entry):
+    """
+    Atomically write a cache entry to disk.  The entry is written to a
+    temporary file only readable by the user, then renamed over the existing
+    entry, so concurrent readers never see a partial write.  Failing to write
+    is not an error, the cache is simply skipped.
+    :param str name: the name of the cache entry
+    :param dict entry: the entry to write
+    """
+    try:
+        cache_dir = get_cache_dir()
+        fd, temp_path = mkstemp(dir=cache_dir, prefix='.%s.' % name)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.rename(temp_path, os.path.join(cache_dir, name))
+        except Exception:
+            os.remove(temp_path)
+            raise
+    except (IOError, OSError, TypeError, ValueError):
+        pass
+
+
+def delete_cache_entry(name):
+    """
+    Delete a cache entry from disk, if it exists
+    :param str name: the name of the cache entry
+    """
+    try:
+        os.remove(os.path.join(get_cache_dir(), name))
+    except (IOError, OSError):
+        pass
+
+
+def prune_cache_entries(prefix, max_size):
+    """
+    Bound the total size of the cache entries whose names start with the
+    prefix, deleting the least recently written entries until they fit.
+    Failing to list or delete an entry is not an error.
+    :param str prefix: the prefix of the entries' names (e.g response-)
+    :param int max_size: the maximum total size of the entries, in bytes
+    """
+    try:
+        cache_dir = get_cache_dir()
+        entries = []
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix):
+                stat = os.stat(os.path.join(cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+    except (IOError, OSError):
+        return
+    total_size = sum(size for mtime, size, name in entries)
+    for mtime, size, name in sorted(entries):
+        if total_size <= max_size:
+            break
+        delete_cache_entry(name)
+        total_size -= size
+
+
+def get_cached_items(api_base_url, name, list_items_fn, params=None, cache_ttl=CATALOG_CACHE_TTL, force_refresh=False):
+    """
+    Get catalog data, such as the locations or cloud regions, from the disk
+    cache if it was retrieved less than cache_ttl seconds ago, otherwise
+    retrieve it and cache it.  Entries are keyed by the api_base_url, the
+    catalog's name and its query params.
+    :param str api_base_url: the Pureport API url
+    :param str name: the name of the catalog (e.g locations)
+    :param () -> T list_items_fn: a function that retrieves the catalog from the API
+    :param dict params: the query params of the catalog, if any
+    :param int cache_ttl: the number of seconds to cache the catalog for, or 0 to not cache it
+    :param bool force_refresh: retrieve the catalog from the API, even if it is cached
+    :rtype: T
+    """
+    entry_name = 'catalog-%s.json' % get_cache_key(api_base_url, name, json.dumps(params, sort_keys=True))
+    if cache_ttl > 0 and not force_refresh:
+        entry = read_cache_entry(entry_name)
+        if entry is not None and entry.get('expires_at', 0) > time():
+            return entry['items']
+    items = list_items_fn()
+    if cache_ttl > 0:
+        write_cache_entry(entry_name, dict(items=items, expires_at=time() + cache_ttl))
+    return items
+
+
+def get_cached_catalog(module, name, list_items_fn, params=None):
+    """
+    Get catalog data, such as the locations or cloud regions, as get_cached_items
+    does, using the module's api_base_url, cache_ttl and force_refresh params
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :param str name: the name of the catalog (e.g locations)
+    :param () -> T list_items_fn: a function that retrieves the catalog from the API
+    :param dict params: the query params of the catalog, if any
+    :rtype: T
+    """
+    return get_cached_items(module.params.get('api_base_url'),
+                            name,
+                            list_items_fn,
+                            params=params,
+                            cache_ttl=module.params.get('cache_ttl'),
+                            force_refresh=module.params.get('force_refresh'))
@@ -1,12 +1,54 @@
 from functools import partial
+from multiprocessing.pool import ThreadPool
+from time import sleep, time
 from traceback import format_exc
+from ansible.module_utils.common.dict_transformations import \
+    camel_dict_to_snake_dict, \
+    snake_dict_to_camel_dict
+from ansible.module_utils.parsing.convert_bool import boolean
 try:
-    from pureport.exception.api import ClientHttpException, NotFoundException
+    from pureport.exception.api import \
+        ClientHttpException, \
+        NotFoundException
 except ImportError:
     ClientHttpException = None
     NotFoundException = None
-from .pureport import get_client, get_network
-from .pureport_crud import item_crud, deep_compare
+from .pureport import get_client, get_client_session, get_network, patch_item
+from .pureport_crud import \
+    item_crud, \
+    deep_diff, \
+    get_item_diff, \
+    get_item_patch, \
+    get_item_index, \
+    find_indexed_items, \
+    invalidate_item_indexes
+
+# Connection keys which are not simply the camel case form of their snake case name
+CONNECTION_KEY_CORRECTIONS = dict(
+    customerAsn='customerASN',
+    primaryCustomerRouterIp='primaryCustomerRouterIP',
+    secondaryCustomerRouterIp='secondaryCustomerRouterIP',
+    enableBgpPassword='enableBGPPassword'
+)
+
+# The desired states of the connections reconciled by the connections module
+CONNECTION_STATES = ('present', 'absent')
+# The states a connection may be waited for, and the states which mean it
+# will never reach them
+CONNECTION_FAILED_STATES = dict(
+    ACTIVE=['FAILED_TO_PROVISION', 'FAILED_TO_UPDATE', 'FAILED_TO_DELETE', 'DELETING', 'DELETED'],
+    DELETED=['FAILED_TO_DELETE']
+)
+# The default number of seconds to wait for connections to reach a state
+CONNECTION_WAIT_TIMEOUT = 600
+# A connection is polled after this delay, which doubles up to the maximum
+# delay for as long as its state does not change
+CONNECTION_POLL_MIN_DELAY = 1
+CONNECTION_POLL_MAX_DELAY = 30
+
+# The ETags of connections returned when they were created or updated, by
+# their href, recorded when wait_for_server is async
+__CONNECTION_ETAGS = dict()
 
 
 def get_wait_for_server_argument_spec():
@@ -15,10 +57,25 @@ def get_wait_for_server_argument_spec():
     :rtype: dict[str, dict]
     """
     return dict(
-        wait_for_server=dict(type='bool', default=False)
+        wait_for_server=dict(type='raw', default=False)
     )
 
 
+def get_wait_for_server(module):
+    """
+    Get the wait_for_server param, which is either a boolean or 'async'
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :rtype: bool|str
+    """
+    wait_for_server = module.params.get('wait_for_server')
+    if wait_for_server == 'async':
+        return wait_for_server
+    try:
+        return boolean(wait_for_server)
+    except TypeError:
+        module.fail_json(msg="wait_for_server must be a boolean or 'async', got '%s'." % wait_for_server)
+
+
 def get_connection_argument_spec():
     """
     Return basic params for a connection
@@ -58,6 +115,15 @@ def get_peering_connection_argument_spec():
     )
 
 
+def __get_connections_listing_key(network):
+    """
+    Get the listing key of a network's connections
+    :param Network network: the network
+    :rtype: str
+    """
+    return '%s/connections' % network['href']
+
+
 def __retrieve_connection(module, client, connection):
     """
     Retrieve the Connection from the Ansible inferred Connection
@@ -89,10 +155,10 @@ def __resolve_connection(module, client, connection):
     network = get_network(module)
     if network is not None:
         try:
-            existing_connections = client.networks.connections(network).list()
-            matched_connections = [existing_connection for existing_connection in existing_connections
-                                   if all([existing_connection.get(k) == connection.get(k)
-                                           for k in ['name', 'type']])]
+            matched_connections = find_indexed_items(__get_connections_listing_key(network),
+                                                     lambda: client.networks.connections(network).list(),
+                                                     ('name', 'type'),
+                                                     connection)
             if len(matched_connections) == 1:
                 return matched_connections[0]
             elif len(matched_connections) > 1:
@@ -123,6 +189,65 @@ def __copy_existing_connection_properties(connection, existing_connection):
     return copied_connection
 
 
+def __record_connection_etag(response, *args, **kwargs):
+    """
+    A response hook which records the ETag of a created, updated or patched connection,
+    so its job can later be checked with a conditional request
+    :param requests.Response response: the response
+    """
+    etag = response.headers.get('ETag')
+    if etag is None or response.request.method not in ('POST', 'PUT', 'PATCH'):
+        return
+    try:
+        connection = response.json()
+    except ValueError:
+        return
+    if isinstance(connection, dict) and connection.get('href') is not None:
+        __CONNECTION_ETAGS[connection['href']] = etag
+
+
+def __add_record_connection_etag_hook(client):
+    """
+    Add the hook recording connection ETags to a client, if it has not already
+    been added, as clients may be reused
+    :param pureport.api.client.Client client: the Pureport client
+    """
+    hooks = get_client_session(client).hooks['response']
+    if __record_connection_etag not in hooks:
+        hooks.append(__record_connection_etag)
+
+
+def __get_connection_job(connection, expected_state):
+    """
+    Get the job token of a connection operation which was not waited for
+    :param Connection connection: the connection
+    :param str expected_state: the state the connection is expected to reach
+    :rtype: dict|None
+    """
+    if connection.get('href') is None:
+        return None
+    return dict(
+        href=connection['href'],
+        expected_state=expected_state,
+        state=connection.get('state') if expected_state != 'DELETED' else None,
+        etag=__CONNECTION_ETAGS.get(connection['href']) if expected_state != 'DELETED' else None
+    )
+
+
+def get_connection_job(module, connection):
+    """
+    Get the job token of a connection module's operation when wait_for_server
+    is async, which can be checked with the 'connection_status' module
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :param Connection connection: the created, updated or deleted connection
+    :returns: the job or None if wait_for_server is not async
+    :rtype: dict|None
+    """
+    if get_wait_for_server(module) != 'async' or connection is None:
+        return None
+    return __get_connection_job(connection, 'DELETED' if module.params.get('state') == 'absent' else 'ACTIVE')
+
+
 def __create_connection(module, client, wait_for_server, connection):
     """
     Create a new connection
@@ -154,6 +279,31 @@ def __update_connection(module, client, wait_for_server, connection):
         module.fail_json(msg=e.response.text, exception=format_exc())
 
 
+def __patch_connection(module, client, wait_for_server, connection, patch):
+    """
+    Partially update a Connection, falling back to a full update if the API
+    does not support it
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :param pureport.api.client.Client client: the Pureport client
+    :param bool wait_for_server: should the client wait for the server to finish
+    :param Connection connection: the Ansible inferred Connection
+    :param dict patch: the changed fields of the Connection
+    :rtype: Connection
+    """
+    try:
+        patched_connection = patch_item(client, connection, patch)
+    except ClientHttpException as e:
+        module.fail_json(msg=e.response.text, exception=format_exc())
+    if patched_connection is None:
+        return __update_connection(module, client, wait_for_server, connection)
+    if wait_for_server:
+        wait_result = wait_for_connections(client, [(patched_connection, 'ACTIVE')])[0]
+        if 'msg' in wait_result:
+            module.fail_json(msg=wait_result['msg'])
+        patched_connection = wait_result['connection']
+    return patched_connection
+
+
 def __delete_connection(module, client, wait_for_server, connection):
     """
     Delete a connection
@@ -171,18 +321,21 @@ def __delete_connection(module, client, wait_for_server, connection):
 
 def connection_crud(module,
                     construct_item_fn,
-                    compare_item_fn=deep_compare):
+                    compare_item_fn=deep_diff):
     """
     Handle a basic connection's Ansible CRUD operations
     :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
     :param () -> T construct_item_fn:
         A function that creates the item from the Ansible module params
-    :param (T, T) -> boolean compare_item_fn:
+    :param (T, T) -> boolean|list[(str, *, *)] compare_item_fn:
         A function that compares the Ansible item with the retrieved item
-    :rtype: (bool, T, T, T)
+    :rtype: (bool, T, T, T, dict)
     """
     client = get_client(module)
-    wait_for_server = module.params.get('wait_for_server')
+    wait_for_server = get_wait_for_server(module)
+    if wait_for_server == 'async':
+        __add_record_connection_etag_hook(client)
+    wait_for_server = wait_for_server is True
     return item_crud(
         module,
         construct_item_fn,
@@ -192,5 +345,326 @@ def connection_crud(module,
         partial(__update_connection, module, client, wait_for_server),
         partial(__delete_connection, module, client, wait_for_server),
         compare_item_fn=compare_item_fn,
-        copy_existing_item_properties_fn=__copy_existing_connection_properties
+        copy_existing_item_properties_fn=__copy_existing_connection_properties,
+        patch_item_fn=partial(__patch_connection, module, client, wait_for_server),
+        to_api_item_fn=to_api_connection
+    )
+
+
+def get_connections_argument_spec():
+    """
+    Return basic params for reconciling a list of connections
+    :rtype: dict[str, dict]
+    """
+    return dict(
+        connections=dict(type='list', required=True),
+        parallelism=dict(type='int', default=10)
     )
+
+
+def to_api_connection(connection):
+    """
+    Convert a snake case Connection, such as one returned by a connection
+    module, to the camel case Connection the API expects
+    :param dict connection: the snake case Connection
+    :rtype: Connection
+    """
+    api_connection = snake_dict_to_camel_dict(connection)
+    for key, corrected_key in CONNECTION_KEY_CORRECTIONS.items():
+        if key in api_connection:
+            api_connection[corrected_key] = api_connection.pop(key)
+    return api_connection
+
+
+def __apply_connection_operation(client, network, operation):
+    """
+    Apply a single create, update or delete operation, without waiting for
+    the server to finish.  This runs on a worker thread, so failures are
+    returned rather than failing the module.
+    :param pureport.api.client.Client client: the Pureport client
+    :param Network network: the network of the connections
+    :param tuple[str, Connection, dict|None] operation: the operation name, its Connection
+        and the changed fields of the Connection for a partial update
+    :returns: the resulting Connection and an error message if the operation failed
+    :rtype: (Connection, str|None)
+    """
+    name, connection, patch = operation
+    try:
+        if name == 'create':
+            return client.networks.connections(network).create(connection), None
+        elif name == 'update':
+            patched_connection = patch_item(client, connection, patch) if patch is not None else None
+            if patched_connection is not None:
+                return patched_connection, None
+            return client.connections.update(connection), None
+        client.connections.delete(connection)
+        return connection, None
+    except NotFoundException as e:
+        # A connection which no longer exists is already deleted
+        return connection, e.response.text if name != 'delete' else None
+    except ClientHttpException as e:
+        return connection, e.response.text
+    except Exception as e:
+        # Any other failure, such as a connection error, fails only this operation
+        return connection, str(e)
+
+
+def apply_connection_operations(client, network, operations, parallelism=10):
+    """
+    Apply many create, update or delete operations concurrently, using a
+    bounded pool of workers, without waiting for the server to finish.
+    :param pureport.api.client.Client client: the Pureport client
+    :param Network network: the network of the connections
+    :param list[tuple[str, Connection, dict|None]] operations: the operation names, their
+        Connections and the changed fields of the Connections for partial updates
+    :param int parallelism: the maximum number of operations applied concurrently
+    :returns: the resulting Connection and an error message if the operation failed,
+        per operation, in the order they were provided
+    :rtype: list[(Connection, str|None)]
+    """
+    pool = ThreadPool(max(1, min(parallelism, len(operations))))
+    try:
+        applied_operations = pool.map(partial(__apply_connection_operation, client, network), operations)
+    finally:
+        pool.close()
+        pool.join()
+    invalidate_item_indexes()
+    return applied_operations
+
+
+def __poll_connection(client, connection):
+    """
+    Retrieve the current state of a connection.  This runs on a worker thread,
+    so failures are returned rather than failing the module.
+    :param pureport.api.client.Client client: the Pureport client
+    :param Connection connection: the connection, which must have an href
+    :returns: the connection, which is None if it no longer exists, and an
+        error message if it could not be retrieved
+    :rtype: (Connection|None, str|None)
+    """
+    try:
+        return client.connections.get(connection), None
+    except NotFoundException:
+        return None, None
+    except ClientHttpException as e:
+        return connection, e.response.text
+    except Exception as e:
+        # Any other failure, such as a connection error, fails only this connection
+        return connection, str(e)
+
+
+def wait_for_connections(client, waits, timeout=CONNECTION_WAIT_TIMEOUT, parallelism=10):
+    """
+    Wait for many connections to reach their expected states, such as ACTIVE
+    after being created or DELETED after being deleted, at the same time.
+    Each connection is polled on its own schedule using a backoff that resets
+    whenever the connection's state changes, and due connections are polled
+    concurrently using a bounded pool of workers.  This returns as soon as
+    every connection reached its state, failed to, or the timeout elapsed,
+    in which case the pending connections are polled one last time.
+    :param pureport.api.client.Client client: the Pureport client
+    :param list[(Connection, str)] waits: the connections and their expected states,
+        either ACTIVE or DELETED
+    :param int timeout: the maximum number of seconds to wait
+    :param int parallelism: the maximum number of connections polled concurrently
+    :returns: a result per connection, in the order they were provided, with the
+        last retrieved connection, its state, the number of polls, the seconds
+        taken to reach the expected state and an error message if it did not
+    :rtype: list[dict]
+    """
+    start = time()
+    deadline = start + timeout
+    results = [dict(
+        connection=connection,
+        expected_state=expected_state,
+        state=connection.get('state'),
+        polls=0,
+        elapsed=None,
+        delay=CONNECTION_POLL_MIN_DELAY,
+        # A connection whose state is already known was just retrieved
+        next_poll=min(start + CONNECTION_POLL_MIN_DELAY, deadline) if connection.get('state') is not None else start
+    ) for connection, expected_state in waits]
+
+    pending = list(results)
+    pool = ThreadPool(max(1, min(parallelism, len(pending))))
+    try:
+        while len(pending) > 0:
+            now = time()
+            due = [result for result in pending if result['next_poll'] <= now]
+            polled = pool.map(partial(__poll_connection, client), [result['connection'] for result in due])
+            now = time()
+            for result, (connection, error) in zip(due, polled):
+                result['polls'] += 1
+                if error is not None:
+                    result['msg'] = error
+                    continue
+                state = connection['state'] if connection is not None else 'DELETED'
+                if connection is not None:
+                    result['connection'] = connection
+                if state == result['expected_state']:
+                    result['elapsed'] = round(now - start, 3)
+                elif state in CONNECTION_FAILED_STATES[result['expected_state']]:
+                    result['msg'] = "Connection entered the %s state while waiting for it " \
+                                    "to become %s." % (state, result['expected_state'])
+                elif state != result['state']:
+                    result['delay'] = CONNECTION_POLL_MIN_DELAY
+                else:
+                    result['delay'] = min(result['delay'] * 2, CONNECTION_POLL_MAX_DELAY)
+                result['state'] = state
+                if result['elapsed'] is None and 'msg' not in result and now >= deadline:
+                    # This was the last poll, at the deadline
+                    result['msg'] = "Timed out after %d seconds waiting for the connection " \
+                                    "to become %s." % (timeout, result['expected_state'])
+                # Polls are never scheduled past the deadline
+                result['next_poll'] = min(now + result['delay'], deadline)
+
+            pending = [result for result in pending if result['elapsed'] is None and 'msg' not in result]
+            if len(pending) > 0:
+                sleep(max(0, min(result['next_poll'] for result in pending) - time()))
+    finally:
+        pool.close()
+        pool.join()
+
+    for result in results:
+        del result['delay']
+        del result['next_poll']
+    return results
+
+
+def connections_crud(module):
+    """
+    Reconcile a list of connections for a network in a single pass.  The
+    network's connections are listed once and matched against each of the
+    Ansible defined connections, after which all of the creates, updates and
+    deletes are sent concurrently using a bounded pool of workers.
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :returns: whether any connection changed, a result per connection, in the
+        order they were provided, and a diff per changed connection for
+        Ansible's diff mode
+    :rtype: (bool, list[dict], list[dict])
+    """
+    client = get_client(module)
+    network = get_network(module)
+    wait_for_server = get_wait_for_server(module)
+    resolve_existing = module.params.get('resolve_existing')
+    partial_update = module.params.get('partial_update')
+
+    listing_key = __get_connections_listing_key(network)
+    list_connections_fn = client.networks.connections(network).list
+    try:
+        existing_connections_by_id = get_item_index(listing_key, list_connections_fn, ('id',))
+        existing_connections_by_name = get_item_index(listing_key, list_connections_fn, ('name', 'type'))
+    except ClientHttpException as e:
+        module.fail_json(msg=e.response.text, exception=format_exc())
+
+    operations = []
+    results = []
+    diffs = []
+    for connection in module.params.get('connections'):
+        connection = dict(connection)
+        state = connection.pop('connection_state', 'present')
+        if state not in CONNECTION_STATES:
+            module.fail_json(msg="Invalid connection_state '%s' for the connection '%s', it must be one of %s." %
+                                 (state, connection.get('name'), ', '.join(CONNECTION_STATES)))
+        # The API's state of a connection (e.g ACTIVE) is read only, such as
+        # when passing connections returned by connections_info
+        connection.pop('state', None)
+        connection = to_api_connection(connection)
+
+        existing_connection = None
+        if connection.get('id') is not None:
+            matched_connections = existing_connections_by_id.get((connection.get('id'),), [])
+            existing_connection = matched_connections[0] if len(matched_connections) > 0 else None
+        elif resolve_existing:
+            matched_connections = existing_connections_by_name.get((connection.get('name'), connection.get('type')), [])
+            if len(matched_connections) > 1:
+                module.fail_json(msg="Resolved more than one existing connection named '%s'.  Please provide an 'id' "
+                                     "if you are attempting to update/delete an existing connection.  "
+                                     "Otherwise, use a more distinct name & type or set "
+                                     "'resolve_existing' to false." % connection.get('name'))
+            elif len(matched_connections) == 1:
+                existing_connection = matched_connections[0]
+
+        changed_connection = connection
+        if existing_connection is not None:
+            changed_connection = __copy_existing_connection_properties(connection, existing_connection)
+
+        differences = None
+        if state == 'present' and existing_connection is not None:
+            differences = deep_diff(changed_connection, existing_connection)
+
+        operation = None
+        if state == 'present' and existing_connection is None:
+            operation = ('create', changed_connection, None)
+        elif state == 'present' and len(differences) > 0:
+            operation = ('update',
+                         changed_connection,
+                         get_item_patch(changed_connection, differences) if partial_update else None)
+        elif state == 'absent' and existing_connection is not None:
+            operation = ('delete', existing_connection, None)
+        if operation is not None:
+            operations.append(operation)
+            diff = get_item_diff(operation[0] == 'create',
+                                 operation[0] == 'update',
+                                 operation[0] == 'delete',
+                                 changed_connection,
+                                 existing_connection,
+                                 differences)
+            diff.update(before_header=connection.get('name'), after_header=connection.get('name'))
+            diffs.append(diff)
+        result = dict(
+            changed=operation is not None,
+            state=state,
+            connection=existing_connection if existing_connection is not None else connection
+        )
+        if operation is not None and operation[0] == 'update':
+            result['differences'] = [path for path, value, existing_value in differences]
+        results.append(result)
+
+    changed = len(operations) > 0
+    if module.check_mode or not changed:
+        for result in results:
+            del result['state']
+            result['connection'] = camel_dict_to_snake_dict(result['connection'])
+        return changed, results, diffs
+
+    if wait_for_server == 'async':
+        __add_record_connection_etag_hook(client)
+    parallelism = module.params.get('parallelism')
+    applied_operations = apply_connection_operations(client, network, operations, parallelism)
+
+    # Rather than each worker blocking on its own connection, wait for all of
+    # the applied connections together
+    if wait_for_server is True:
+        waited = [i for i, (connection, error) in enumerate(applied_operations) if error is None]
+        wait_results = wait_for_connections(
+            client,
+            [(applied_operations[i][0], 'DELETED' if operations[i][0] == 'delete' else 'ACTIVE') for i in waited],
+            parallelism=parallelism
+        )
+        for i, wait_result in zip(waited, wait_results):
+            error = None
+            if 'msg' in wait_result:
+                error = 'Connection failed to reach the expected state while ' \
+                        'waiting for the %s to complete.  %s' % (operations[i][0], wait_result['msg'])
+            applied_operations[i] = (wait_result['connection'], error)
+
+    errors = []
+    applied_operations = iter(applied_operations)
+    for result in results:
+        if result['changed']:
+            result['connection'], error = next(applied_operations)
+            if error is not None:
+                result['msg'] = error
+                errors.append("%s: %s" % (result['connection'].get('name'), error))
+            elif wait_for_server == 'async':
+                result['job'] = __get_connection_job(result['connection'],
+                                                     'DELETED' if result['state'] == 'absent' else 'ACTIVE')
+        del result['state']
+        result['connection'] = camel_dict_to_snake_dict(result['connection'])
+    if len(errors) > 0:
+        module.fail_json(msg="Failed to reconcile %d connection(s).  %s" % (len(errors), '  '.join(errors)),
+                         changed=True,
+                         results=results,
+                         diff=diffs)
+    return changed, results, diffs
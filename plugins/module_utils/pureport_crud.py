@@ -1,3 +1,26 @@
+from time import time
+from ansible.module_utils.common.dict_transformations import snake_dict_to_camel_dict
+from .pureport_metrics import METRICS_RESULT_KEY
+from .pureport_retry import RETRIES_RESULT_KEY
+
+# The key with which item_crud stamps the items it returns with the time they
+# were retrieved from the server, so they can be passed back as 'existing'
+RETRIEVED_AT_KEY = 'retrievedAt'
+# The default number of seconds for which an 'existing' item is fresh
+EXISTING_MAX_AGE = 60
+# The keys Ansible and the module utils add to a registered result, which are
+# not part of the item
+__RESULT_KEYS = ('changed', 'failed', 'msg', 'diff', 'job', 'invocation', 'warnings', 'deprecations',
+                 'exception', 'attempts', 'skipped', 'skip_reason', 'ansible_facts',
+                 METRICS_RESULT_KEY, RETRIES_RESULT_KEY)
+# The params of the parent of an item, and the keys of the parent in the item
+__PARENT_KEYS = (('account_href', 'account'), ('network_href', 'network'))
+
+# Listings of items and the indexes built from them, keyed by the listing
+# they were retrieved from.  These live for a single module, so repeated
+# resolves share a single listing, and are invalidated after writes and
+# before each module run in-process by the run_module action.
+__ITEM_LISTINGS = dict()
 
 
 def get_state_argument_spec():
@@ -20,46 +43,256 @@ def get_resolve_existing_argument_spec():
     )
 
 
+def get_existing_argument_spec():
+    """
+    Return the basic existing params
+    :rtype: dict[str, dict]
+    """
+    return dict(
+        existing=dict(type='dict'),
+        existing_max_age=dict(type='int', default=EXISTING_MAX_AGE)
+    )
+
+
+def get_partial_update_argument_spec():
+    """
+    Return the basic partial_update param
+    :rtype: dict[str, dict]
+    """
+    return dict(
+        partial_update=dict(type='bool', default=False)
+    )
+
+
+def get_item_patch(item, differences):
+    """
+    Get the top level fields of an item which differ from the existing item,
+    for a partial update
+    :param dict item: the item
+    :param list[(str, *, *)] differences: the differing paths, as returned by deep_diff
+    :rtype: dict
+    """
+    fields = set(path.split('.', 1)[0].split('[', 1)[0] for path, value, existing_value in differences)
+    return dict((field, item.get(field)) for field in fields)
+
+
+def get_item_index(listing_key, list_items_fn, keys):
+    """
+    Get an index of a listing's items by the values of some of their keys.
+    The listing is only retrieved once, and each index is only built once,
+    until the listings are invalidated.
+    :param str listing_key: a key uniquely identifying the listing, such as its href
+    :param () -> list[T] list_items_fn: a function that retrieves the listing
+    :param tuple[str] keys: the item keys to index by
+    :rtype: dict[tuple, list[T]]
+    """
+    listing = __ITEM_LISTINGS.get(listing_key)
+    if listing is None:
+        listing = dict(items=list_items_fn(), indexes=dict())
+        __ITEM_LISTINGS[listing_key] = listing
+    index = listing['indexes'].get(keys)
+    if index is None:
+        index = dict()
+        for listed_item in listing['items']:
+            index.setdefault(tuple(listed_item.get(k) for k in keys), []).append(listed_item)
+        listing['indexes'][keys] = index
+    return index
+
+
+def find_indexed_items(listing_key, list_items_fn, keys, item):
+    """
+    Find the items of a listing which have the same values for the keys as the item
+    :param str listing_key: a key uniquely identifying the listing, such as its href
+    :param () -> list[T] list_items_fn: a function that retrieves the listing
+    :param tuple[str] keys: the item keys to match on
+    :param T item: the item to match
+    :rtype: list[T]
+    """
+    return get_item_index(listing_key, list_items_fn, keys).get(tuple(item.get(k) for k in keys), [])
+
+
+def invalidate_item_indexes():
+    """
+    Invalidate all listings and their indexes, which should be done after
+    any item is created, updated or deleted.
+    """
+    __ITEM_LISTINGS.clear()
+
+
+def __is_false_or_empty(existing_value):
+    """
+    An item's None value matches an existing value which the server returns
+    as a false boolean, empty list or empty dict.
+    :param * existing_value:
+    :rtype: bool
+    """
+    return existing_value is False or \
+        (isinstance(existing_value, (dict, list)) and len(existing_value) == 0)
+
+
 def deep_compare(item, existing_item):
     """
-    Given an item and an existing item, this recursively compares that all
-    set keys/indexes in the item object are present in the existing item.
+    Given an item and an existing item, this compares that all set
+    keys/indexes in the item object are present in the existing item.  A key
+    missing from the existing item compares as None, and a list in the
+    existing item may be longer, but not shorter, than the item's list.  The
+    items are walked with an explicit stack, stopping at the first difference.
     :param * item:
     :param * existing_item:
     :returns: True if the objects are the same
     :rtype: bool
     """
-    def compare(sub_item, sub_existing_item):
-        # Compare dicts
+    if not isinstance(item, (dict, list)):
+        return item == existing_item or (item is None and __is_false_or_empty(existing_item))
+    # Values are compared in place, only nested dicts and lists are stacked
+    stack = [(item, existing_item)]
+    while len(stack) > 0:
+        sub_item, sub_existing_item = stack.pop()
         if isinstance(sub_item, dict) and isinstance(sub_existing_item, dict):
-            for k in sub_item:
-                try:
-                    if compare(sub_item[k], sub_existing_item[k]) is False:
-                        return False
-                except KeyError:
-                    # If the item has a key, but the existing one does not, check
-                    # if the item's value is None
-                    if compare(sub_item[k], None) is False:
-                        return False
-            return True
-        # Compare lists
-        if isinstance(sub_item, list) and isinstance(sub_existing_item, list):
-            try:
-                return all(compare(sub_item[i], sub_existing_item[i]) for i in range(len(sub_item)))
-            except IndexError:
-                # Lists were of different size
+            for k, value in sub_item.items():
+                existing_value = sub_existing_item.get(k)
+                if isinstance(value, (dict, list)):
+                    stack.append((value, existing_value))
+                elif value != existing_value and not (value is None and __is_false_or_empty(existing_value)):
+                    return False
+        elif isinstance(sub_item, list) and isinstance(sub_existing_item, list):
+            if len(sub_existing_item) < len(sub_item):
                 return False
-        # Compare the item to the existing item.  There's also a special case here
-        # where the item may have been None, but the server returns a false boolean, empty list or empty dict.
-        if sub_item == sub_existing_item:
-            return True
-        elif sub_item is None:
-            return (isinstance(sub_existing_item, bool) and sub_existing_item is False) or \
-                   (isinstance(sub_existing_item, dict) and len(sub_existing_item.items()) == 0) or \
-                   (isinstance(sub_existing_item, list) and len(sub_existing_item) == 0)
-        return False
+            for value, existing_value in zip(sub_item, sub_existing_item):
+                if isinstance(value, (dict, list)):
+                    stack.append((value, existing_value))
+                elif value != existing_value and not (value is None and __is_false_or_empty(existing_value)):
+                    return False
+        elif sub_item != sub_existing_item:
+            # A dict or list whose existing value is of another type
+            return False
+    return True
+
+
+def __format_path(path):
+    """
+    Format a path, linked as (parent path, key) tuples, like nat.mappings[2].nativeCidr
+    :param tuple|None path: the path
+    :rtype: str
+    """
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(key)
+    formatted_path = ''
+    for key in reversed(keys):
+        if isinstance(key, int):
+            formatted_path += '[%d]' % key
+        else:
+            formatted_path += ('.%s' if formatted_path else '%s') % key
+    return formatted_path
+
+
+def deep_diff(item, existing_item):
+    """
+    Given an item and an existing item, this compares them exactly as
+    deep_compare does, but rather than stopping at the first difference, it
+    collects every path at which the existing item differs in a single pass.
+    Paths are only formatted when they differ.
+    :param * item:
+    :param * existing_item:
+    :returns: the differing paths (e.g nat.mappings[2].nativeCidr), with the
+        item's and the existing item's values, or an empty list if the objects
+        are the same
+    :rtype: list[(str, *, *)]
+    """
+    differences = []
+    if not isinstance(item, (dict, list)):
+        if not (item == existing_item or (item is None and __is_false_or_empty(existing_item))):
+            differences.append(('', item, existing_item))
+        return differences
+    stack = [(None, item, existing_item)]
+    while len(stack) > 0:
+        path, sub_item, sub_existing_item = stack.pop()
+        if isinstance(sub_item, dict) and isinstance(sub_existing_item, dict):
+            pairs = ((k, value, sub_existing_item.get(k)) for k, value in sub_item.items())
+        elif isinstance(sub_item, list) and isinstance(sub_existing_item, list) and \
+                len(sub_existing_item) >= len(sub_item):
+            pairs = ((i, value, existing_value) for i, (value, existing_value)
+                     in enumerate(zip(sub_item, sub_existing_item)))
+        else:
+            # A shorter list, or a dict or list whose existing value is of another type
+            if sub_item != sub_existing_item:
+                differences.append((__format_path(path), sub_item, sub_existing_item))
+            continue
+        nested = []
+        for key, value, existing_value in pairs:
+            if isinstance(value, (dict, list)):
+                nested.append(((path, key), value, existing_value))
+            elif value != existing_value and not (value is None and __is_false_or_empty(existing_value)):
+                differences.append((__format_path((path, key)), value, existing_value))
+        # Nested values are stacked in reverse, so they are reported in order
+        stack.extend(reversed(nested))
+    return differences
 
-    return compare(item, existing_item)
+
+def get_item_diff(create_item, update_item, delete_item, changed_item, existing_item, differences):
+    """
+    Get the diff of an item's change for Ansible's diff mode.  Updates only
+    show the differing paths, rather than the whole item.
+    :param bool create_item: if the item is created
+    :param bool update_item: if the item is updated
+    :param bool delete_item: if the item is deleted
+    :param T changed_item: the item to create or update
+    :param T|None existing_item: the existing item
+    :param list[(str, *, *)]|None differences: the differing paths, if known
+    :rtype: dict
+    """
+    if create_item:
+        return dict(before=dict(), after=changed_item)
+    elif delete_item:
+        return dict(before=existing_item, after=dict())
+    elif update_item and differences is not None:
+        return dict(
+            before=dict((path, existing_value) for path, value, existing_value in differences),
+            after=dict((path, value) for path, value, existing_value in differences)
+        )
+    elif update_item:
+        return dict(before=existing_item, after=changed_item)
+    return dict(before=dict(), after=dict())
+
+
+def __get_fresh_existing_item(module, item, to_api_item_fn):
+    """
+    Get the existing item from the module's existing param, which is the
+    registered result of a previous task, if it is the same item and it was
+    retrieved recently enough to be used without retrieving it again
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :param T item: the Ansible item
+    :param (dict) -> T to_api_item_fn: converts the snake case result to the item
+    :rtype: T|None
+    """
+    existing = module.params.get('existing')
+    if existing is None or existing.get('href') is None or existing.get('retrieved_at') is None:
+        return None
+    try:
+        retrieved_at = float(existing.get('retrieved_at'))
+    except (TypeError, ValueError):
+        # An unparsable time is treated as stale
+        return None
+    if time() - retrieved_at > module.params.get('existing_max_age'):
+        return None
+    if item.get('id') is not None:
+        if item.get('id') != existing.get('id'):
+            return None
+    elif not module.params.get('resolve_existing') or \
+            item.get('name') != existing.get('name') or \
+            item.get('type') != existing.get('type'):
+        return None
+    else:
+        # The same name may be used by items of another account or network
+        for param, key in __PARENT_KEYS:
+            parent = existing.get(key)
+            if module.params.get(param) is not None and \
+                    (parent.get('href') if isinstance(parent, dict) else None) != module.params.get(param):
+                return None
+    return to_api_item_fn(dict((k, v) for k, v in existing.items()
+                               if k not in __RESULT_KEYS and not k.startswith('_ansible')))
 
 
 def item_crud(module,
@@ -69,8 +302,10 @@ def item_crud(module,
               create_item_fn,
               update_item_fn,
               delete_item_fn,
-              compare_item_fn=deep_compare,
-              copy_existing_item_properties_fn=lambda item, existing_item: item):
+              compare_item_fn=deep_diff,
+              copy_existing_item_properties_fn=lambda item, existing_item: item,
+              patch_item_fn=None,
+              to_api_item_fn=snake_dict_to_camel_dict):
     """
     Handle a basic item's Ansible CRUD operations with state
     and changed functionality
@@ -87,47 +322,84 @@ def item_crud(module,
         A function that updates the existing item
     :param (T) -> T delete_item_fn:
         A function that updates the existing item
-    :param (T, T) -> boolean compare_item_fn:
+    :param (T, T) -> boolean|list[(str, *, *)] compare_item_fn:
         A function that compares the Ansible item with the retrieved item.  Should
-        return True if the items are the same.
+        return True if the items are the same, or, like deep_diff, a list of the
+        paths at which they differ along with their values.
     :param (T, T) -> T copy_existing_item_properties_fn:
         A function that copies existing properties from the retrieved item to the
         new item if the retrieved item exists.
-    :rtype: (bool, T, T, T)
+    :param (T, dict) -> T patch_item_fn:
+        A function that partially updates the existing item, given the item and
+        only its changed fields.  This is used instead of update_item_fn when the
+        module's partial_update param is set and the compare returned differences.
+    :param (dict) -> T to_api_item_fn:
+        A function that converts a snake case item, as registered by a previous
+        task, back to the item.  This is used for the module's existing param,
+        which when fresh enough is used instead of retrieving the existing item.
+    :returns: whether the item changed, the changed item, the Ansible item, the
+        existing item and a diff of the change for Ansible's diff mode.  Unless
+        deleted, the changed item is stamped with the time it was retrieved.
+    :rtype: (bool, T, T, T, dict)
     """
     # Construct item object from the parameters
     item = construct_item_fn()
 
-    # Retrieve the existing item if applicable
-    existing_item = retrieve_existing_item_fn(item)
-    if existing_item is None and module.params.get('resolve_existing'):
-        existing_item = resolve_existing_item_fn(item)
+    # Use the registered existing item if it is fresh, otherwise retrieve the
+    # existing item if applicable
+    existing_item = __get_fresh_existing_item(module, item, to_api_item_fn)
+    if existing_item is None:
+        retrieved_at = time()
+        existing_item = retrieve_existing_item_fn(item)
+        if existing_item is None and module.params.get('resolve_existing'):
+            existing_item = resolve_existing_item_fn(item)
+        if existing_item is not None:
+            existing_item = dict(existing_item)
+            existing_item[RETRIEVED_AT_KEY] = retrieved_at
 
     # Construct changed_item from existing properties
     changed_item = item
     if existing_item is not None:
         changed_item = copy_existing_item_properties_fn(item, existing_item)
 
-    # Perform a simple comparison of the passed in item and existing item
-    items_differ = not compare_item_fn(changed_item, existing_item)
+    # Compare the passed in item and existing item, which may also return
+    # the paths at which they differ
+    comparison = compare_item_fn(changed_item, existing_item)
+    differences = None
+    if isinstance(comparison, bool):
+        items_differ = not comparison
+    else:
+        differences = comparison
+        items_differ = len(differences) > 0
 
     state = module.params.get('state')
     create_item = state == 'present' and existing_item is None
     update_item = state == 'present' and items_differ
     delete_item = state == 'absent' and existing_item is not None
     changed = create_item or update_item or delete_item
+    diff = get_item_diff(create_item, update_item, delete_item, changed_item, existing_item, differences)
 
     if module.check_mode:
-        module.exit_json(changed=changed)
+        module.exit_json(changed=changed, diff=diff)
 
+    retrieved_at = time()
     if create_item:
         changed_item = create_item_fn(changed_item)
+    elif update_item and patch_item_fn is not None and differences is not None and \
+            module.params.get('partial_update'):
+        changed_item = patch_item_fn(changed_item, get_item_patch(changed_item, differences))
     elif update_item:
         changed_item = update_item_fn(changed_item)
     elif delete_item:
         delete_item_fn(changed_item)
-        changed_item = existing_item
+        changed_item = dict(existing_item)
+        changed_item.pop(RETRIEVED_AT_KEY, None)
     elif existing_item is not None:
         changed_item = existing_item
+    if (create_item or update_item) and changed_item is not None:
+        changed_item = dict(changed_item)
+        changed_item[RETRIEVED_AT_KEY] = retrieved_at
+    if changed:
+        invalidate_item_indexes()
 
-    return changed, changed_item, item, existing_item
+    return changed, changed_item, item, existing_item, diff
@@ -0,0 +1,151 @@
+import codecs
+import json
+from itertools import islice
+from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
+from .pureport import get_client_session
+
+# The number of bytes read from a listing's response at a time
+LISTING_CHUNK_SIZE = 64 * 1024
+
+# The paths within an API object each supported filter matches against
+FILTER_PATHS = dict(
+    name=('name',),
+    state=('state',),
+    type=('type',),
+    location_href=('location', 'href'),
+    speed=('speed',)
+)
+
+
+def get_filters_argument_spec():
+    """
+    Return the basic filters and fields params
+    :rtype: dict[str, dict]
+    """
+    return dict(
+        filters=dict(
+            type='dict',
+            default=dict(),
+            options=dict((k, dict(type='list')) for k in FILTER_PATHS)
+        ),
+        fields=dict(type='list', default=[])
+    )
+
+
+def get_listing_argument_spec():
+    """
+    Return the basic listing params
+    :rtype: dict[str, dict]
+    """
+    return dict(
+        max_items=dict(type='int')
+    )
+
+
+def iter_listing(client, path, params=None):
+    """
+    Lazily retrieve a listing from the API.  The response is streamed and its
+    items are decoded one at a time, so the full listing is never held in
+    memory, and the download stops early if the caller stops iterating.  A
+    response which ends before its closing bracket, such as when the
+    connection drops, raises rather than looking like a shorter listing.
+    :param pureport.api.client.Client client: the Pureport client
+    :param str path: the path of the listing (e.g /accounts)
+    :param dict params: the query params of the listing
+    :rtype: iterable[dict]
+    :raises: pureport.exception.api.ClientHttpException
+    :raises: ValueError
+    """
+    response = get_client_session(client).get(path, params=params, stream=True)
+    try:
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder('utf-8')()
+        buffer = ''
+        started = False
+        for chunk in response.iter_content(chunk_size=LISTING_CHUNK_SIZE):
+            buffer += text_decoder.decode(chunk)
+            index = 0
+            while True:
+                while index < len(buffer) and buffer[index] in ' \t\r\n,':
+                    index += 1
+                if index == len(buffer):
+                    break
+                if not started:
+                    if buffer[index] != '[':
+                        raise ValueError('Expected a list from %s' % path)
+                    started = True
+                    index += 1
+                    continue
+                if buffer[index] == ']':
+                    return
+                try:
+                    item, index = decoder.raw_decode(buffer, index)
+                except ValueError:
+                    # The item is incomplete, read the next chunk
+                    break
+                yield item
+            buffer = buffer[index:]
+        buffer += text_decoder.decode(b'', final=True)
+        raise ValueError('The listing from %s ended before it was complete%s' %
+                         (path, ' (%d undecoded characters)' % len(buffer.strip()) if buffer.strip() else ''))
+    finally:
+        response.close()
+
+
+def __get_path(item, path):
+    """
+    Get the value at a path within an item
+    :param dict item: the item
+    :param tuple[str] path: the path of keys
+    :rtype: *
+    """
+    for k in path:
+        if not isinstance(item, dict):
+            return None
+        item = item.get(k)
+    return item
+
+
+def filter_items(module, items):
+    """
+    Lazily filter API items by the module's filters.  An item matches if, for
+    each filter provided, its value is one of the filter's values.
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :param iterable[dict] items: the API items
+    :rtype: iterable[dict]
+    """
+    filters = [(FILTER_PATHS[k], set(str(value) for value in values))
+               for k, values in (module.params.get('filters') or dict()).items()
+               if values]
+    for item in items:
+        if all(str(__get_path(item, path)) in values for path, values in filters):
+            yield item
+
+
+def project_item(module, item):
+    """
+    Project a formatted item onto the module's fields, if any were provided
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :param dict item: the formatted item
+    :rtype: dict
+    """
+    fields = module.params.get('fields')
+    if not fields:
+        return item
+    return dict((k, item[k]) for k in fields if k in item)
+
+
+def format_items(module, items, format_item_fn=camel_dict_to_snake_dict):
+    """
+    Filter, format and project API items for output, stopping after the
+    module's max_items, if provided.  Items are consumed one at a time, so
+    when given a lazy listing only the output is ever held in memory.
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :param iterable[dict] items: the API items
+    :param (dict) -> dict format_item_fn: a function that formats an item for output
+    :rtype: list[dict]
+    """
+    matched_items = filter_items(module, items)
+    if module.params.get('max_items') is not None:
+        matched_items = islice(matched_items, module.params.get('max_items'))
+    return [project_item(module, format_item_fn(item)) for item in matched_items]
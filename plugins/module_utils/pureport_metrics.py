@@ -0,0 +1,127 @@
+import json
+from time import time
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+# The key of the API metrics in module results
+METRICS_RESULT_KEY = 'pureport_metrics'
+
+
+class _CountingRaw(object):
+    def __init__(self, raw, request):
+        """
+        Wraps a response's raw body, counting the bytes read from it as the
+        recorded request's bytes, so the body is never read just to be measured
+        :param urllib3.response.HTTPResponse raw: the raw body
+        :param dict request: the recorded request
+        """
+        self.__raw = raw
+        self.__request = request
+
+    def stream(self, *args, **kwargs):
+        for chunk in self.__raw.stream(*args, **kwargs):
+            self.__request['bytes'] += len(chunk)
+            yield chunk
+
+    def read(self, *args, **kwargs):
+        chunk = self.__raw.read(*args, **kwargs)
+        self.__request['bytes'] += len(chunk or b'')
+        return chunk
+
+    def __getattr__(self, name):
+        return getattr(self.__raw, name)
+
+
+def __record_request(requests, response, *args, **kwargs):
+    """
+    A response hook which records the method, path, status, size, latency and
+    number of retries of every API request.  The size is the Content-Length,
+    if any, otherwise the bytes of the body as they are read.
+    :param list[dict] requests: the recorded requests
+    :param requests.Response response: the response
+    """
+    request = dict(
+        method=response.request.method,
+        path=urlparse(response.request.url).path,
+        status=response.status_code,
+        bytes=0,
+        elapsed=round(response.elapsed.total_seconds(), 6),
+        cached=getattr(response, 'from_cache', False),
+        retries=getattr(response, 'retries', 0),
+        time=round(time(), 6)
+    )
+    try:
+        request['bytes'] = int(response.headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        if response._content_consumed:
+            request['bytes'] = len(response.content or b'')
+        elif response.raw is not None:
+            response.raw = _CountingRaw(response.raw, request)
+    requests.append(request)
+
+
+def __get_metrics(requests):
+    """
+    Summarize the recorded requests for a module result
+    :param list[dict] requests: the recorded requests
+    :rtype: dict
+    """
+    return dict(
+        request_count=len(requests),
+        elapsed=round(sum(request['elapsed'] for request in requests), 6),
+        bytes=sum(request['bytes'] for request in requests),
+        retries=sum(request['retries'] for request in requests),
+        requests=list(requests)
+    )
+
+
+def __write_metrics(metrics_file, module_name, requests):
+    """
+    Append the recorded requests to a JSON lines file, one line per request.
+    Failing to write is not an error, the metrics are simply skipped.
+    :param str metrics_file: the path of the file
+    :param str module_name: the name of the module which sent the requests
+    :param list[dict] requests: the recorded requests
+    """
+    try:
+        with open(metrics_file, 'a') as f:
+            f.write(''.join(json.dumps(dict(request, module=module_name)) + '\n' for request in requests))
+    except (IOError, OSError):
+        pass
+
+
+def __wrap_exit(module, exit_fn, requests):
+    """
+    Wrap a module's exit_json or fail_json to add the API metrics to its result
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :param (**kwargs) -> None exit_fn: the function to wrap
+    :param list[dict] requests: the recorded requests
+    :rtype: (**kwargs) -> None
+    """
+    def exit_with_metrics(**kwargs):
+        kwargs[METRICS_RESULT_KEY] = __get_metrics(requests)
+        metrics_file = module.params.get('api_metrics_file')
+        if metrics_file is not None:
+            __write_metrics(metrics_file, module._name, requests)
+        exit_fn(**kwargs)
+    return exit_with_metrics
+
+
+def install_api_metrics(module, session):
+    """
+    Record every request sent by a Pureport client's session, and report them
+    as pureport_metrics in the module's result.  The module's exit_json and
+    fail_json are only wrapped once, so the requests of every client the
+    module creates are reported together.
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :param pureport.util.api.PureportSession session: the client's session
+    """
+    requests = getattr(module, '_pureport_api_requests', None)
+    if requests is None:
+        requests = []
+        module._pureport_api_requests = requests
+        module.exit_json = __wrap_exit(module, module.exit_json, requests)
+        module.fail_json = __wrap_exit(module, module.fail_json, requests)
+    session.hooks['response'].append(lambda response, *args, **kwargs: __record_request(requests, response))
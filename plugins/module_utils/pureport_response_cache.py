@@ -0,0 +1,118 @@
+try:
+    from requests.adapters import BaseAdapter
+    from requests.models import Response
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+    BaseAdapter = object
+from .pureport_cache import \
+    get_cache_key, \
+    prune_cache_entries, \
+    read_cache_entry, \
+    write_cache_entry
+
+# The prefix of the names of cached response entries
+RESPONSE_CACHE_PREFIX = 'response-'
+# The maximum total size of the cached responses, past which the least
+# recently used responses are evicted
+RESPONSE_CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+# The validators stored with a cached response, and the conditional request
+# headers they are sent back with
+_VALIDATOR_HEADERS = (
+    ('ETag', 'If-None-Match'),
+    ('Last-Modified', 'If-Modified-Since')
+)
+
+
+class ResponseCacheAdapter(BaseAdapter):
+    def __init__(self, adapter, identity):
+        """
+        A :class:`requests.adapters.BaseAdapter` which wraps another adapter,
+        storing the bodies of GET responses which carry an ETag or Last-Modified
+        validator on disk.  Subsequent GETs of the same url are sent as
+        conditional requests, and when the API answers 304 Not Modified, the
+        stored body is served instead.  Entries are keyed by the url and the
+        identity of the caller, so responses are never shared across accounts,
+        and the least recently used entries are evicted once their total size
+        exceeds RESPONSE_CACHE_MAX_SIZE.  Streamed requests are not cached.
+        :param requests.adapters.BaseAdapter adapter: the adapter which sends the requests
+        :param str identity: identifies the caller, such as the API key
+        """
+        super(ResponseCacheAdapter, self).__init__()
+        self.__adapter = adapter
+        self.__identity = identity
+
+    def __get_entry_name(self, request):
+        return '%s%s.json' % (RESPONSE_CACHE_PREFIX, get_cache_key(self.__identity, request.url))
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        # Requests which are already conditional (e.g connection_status) are
+        # left to their caller, and streamed bodies are not read into memory
+        if request.method != 'GET' or stream or \
+                any(header in request.headers for validator, header in _VALIDATOR_HEADERS):
+            return self.__adapter.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert,
+                                       proxies=proxies)
+
+        entry_name = self.__get_entry_name(request)
+        entry = read_cache_entry(entry_name)
+        if entry is not None:
+            for validator, header in _VALIDATOR_HEADERS:
+                if entry['headers'].get(validator) is not None:
+                    request.headers[header] = entry['headers'][validator]
+
+        response = self.__adapter.send(request, stream=False, timeout=timeout, verify=verify, cert=cert,
+                                       proxies=proxies)
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            for validator, header in _VALIDATOR_HEADERS:
+                if response.headers.get(validator) is not None:
+                    entry['headers'][validator] = response.headers[validator]
+            # Writing the entry back also marks it as recently used
+            write_cache_entry(entry_name, entry)
+            return self.__build_response(request, entry)
+        if response.status_code == 200 and \
+                any(response.headers.get(validator) is not None for validator, header in _VALIDATOR_HEADERS):
+            try:
+                write_cache_entry(entry_name, dict(
+                    reason=response.reason,
+                    headers=dict(response.headers),
+                    body=response.content.decode('utf-8')
+                ))
+                prune_cache_entries(RESPONSE_CACHE_PREFIX, RESPONSE_CACHE_MAX_SIZE)
+            except UnicodeDecodeError:
+                pass
+        return response
+
+    def __build_response(self, request, entry):
+        response = Response()
+        response.status_code = 200
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response._content = entry['body'].encode('utf-8')
+        response._content_consumed = True
+        # Lets response hooks, such as the API metrics, tell cache hits apart
+        response.from_cache = True
+        return response
+
+    def close(self):
+        self.__adapter.close()
+
+
+def get_response_cache_adapter(adapter, identity):
+    """
+    Get an adapter which caches the responses of the given adapter on disk
+    :param requests.adapters.BaseAdapter adapter: the adapter which sends the requests
+    :param str identity: identifies the caller, such as the API key
+    :returns: the adapter or None if requests is not available
+    :rtype: ResponseCacheAdapter|None
+    """
+    if not HAS_REQUESTS:
+        return None
+    return ResponseCacheAdapter(adapter, identity)
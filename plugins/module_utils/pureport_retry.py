@@ -0,0 +1,196 @@
+import sys
+from email.utils import mktime_tz, parsedate_tz
+from random import uniform
+from threading import Lock
+from time import sleep, time
+try:
+    from requests.adapters import BaseAdapter
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+    BaseAdapter = object
+from ansible.module_utils.six import reraise
+
+# The first delay between retries, which later delays are jittered from
+RETRY_BASE_DELAY = 1
+# The longest delay between retries
+RETRY_MAX_DELAY = 30
+# The total number of seconds a call may take, including its retries, before
+# it is no longer retried
+RETRY_BUDGET = 120
+# The status codes retried for any request, as the API did not process it
+RETRY_STATUS_CODES = (429,)
+# The status codes only retried for idempotent requests, as the API may have
+# processed them before failing
+RETRY_IDEMPOTENT_STATUS_CODES = (502, 503, 504)
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+# The key of the retry count in module results
+RETRIES_RESULT_KEY = 'pureport_retries'
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header, either a number of seconds or an HTTP date
+    :param str value: the header value
+    :returns: the number of seconds to wait or None if it is missing or invalid
+    :rtype: float|None
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        parsed = parsedate_tz(value)
+        if parsed is None:
+            return None
+        return max(0.0, mktime_tz(parsed) - time())
+
+
+class RetryPolicy(object):
+    def __init__(self, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY, budget=RETRY_BUDGET):
+        """
+        Retries calls with decorrelated jitter, each delay being random between
+        the base delay and three times the previous delay, so concurrent
+        callers spread out instead of retrying in lockstep.  A delay requested
+        by the server, such as a Retry-After, is honored instead.  A call is
+        not retried once its delays would exceed the budget.  The retries of
+        every call are counted, and the policy can be shared by many threads.
+        :param float base_delay: the first delay between retries
+        :param float max_delay: the longest delay between retries
+        :param float budget: the total number of seconds a call may take
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retries = 0
+        self.__lock = Lock()
+
+    def get_delay(self, start, previous_delay, retry_after=None):
+        """
+        Get the delay before the next retry of a call
+        :param float start: the time the call started
+        :param float previous_delay: the previous delay, or the base delay for the first retry
+        :param float retry_after: the delay requested by the server, if any
+        :returns: the delay or None if the call should no longer be retried
+        :rtype: float|None
+        """
+        if retry_after is not None:
+            delay = retry_after + uniform(0, self.base_delay)
+        else:
+            delay = min(self.max_delay, uniform(self.base_delay, previous_delay * 3))
+        if time() + delay - start > self.budget:
+            return None
+        return delay
+
+    def call(self, fn, get_retry):
+        """
+        Call a function, retrying it while its outcome is retryable and the
+        budget allows it
+        :param () -> T fn: the function, which may raise
+        :param (T|None, Exception|None) -> (bool, float|None) get_retry:
+            given the result or the raised exception, returns if it should be
+            retried and the delay requested by the server, if any
+        :returns: the last result and the number of retries, or raises the last exception
+        :rtype: (T, int)
+        """
+        start = time()
+        delay = self.base_delay
+        retries = 0
+        while True:
+            result = None
+            exc_info = None
+            try:
+                result = fn()
+            except Exception:
+                exc_info = sys.exc_info()
+            retry, retry_after = get_retry(result, exc_info[1] if exc_info is not None else None)
+            if retry:
+                delay = self.get_delay(start, delay, retry_after)
+            if not retry or delay is None:
+                if exc_info is not None:
+                    reraise(*exc_info)
+                return result, retries
+            sleep(delay)
+            retries += 1
+            with self.__lock:
+                self.retries += 1
+
+
+class RetryAdapter(BaseAdapter):
+    def __init__(self, adapter, policy):
+        """
+        A :class:`requests.adapters.BaseAdapter` which wraps another adapter,
+        retrying requests the API throttled (429) and, for idempotent methods,
+        requests which failed at a gateway (502, 503 and 504) using the policy.
+        The number of retries is set as `retries` on the returned response.
+        :param requests.adapters.BaseAdapter adapter: the adapter which sends the requests
+        :param RetryPolicy policy: the retry policy
+        """
+        super(RetryAdapter, self).__init__()
+        self.__adapter = adapter
+        self.policy = policy
+
+    def send(self, request, **kwargs):
+        idempotent = request.method in IDEMPOTENT_METHODS
+
+        def get_retry(response, exception):
+            if response is None:
+                return False, None
+            if response.status_code in RETRY_STATUS_CODES or \
+                    (idempotent and response.status_code in RETRY_IDEMPOTENT_STATUS_CODES):
+                # Consume the body, releasing the connection
+                response.content
+                return True, parse_retry_after(response.headers.get('Retry-After'))
+            return False, None
+
+        response, retries = self.policy.call(lambda: self.__adapter.send(request, **kwargs), get_retry)
+        response.retries = retries
+        return response
+
+    def close(self):
+        self.__adapter.close()
+
+
+def get_retry_adapter(adapter, budget=RETRY_BUDGET):
+    """
+    Get an adapter which retries the requests of the given adapter
+    :param requests.adapters.BaseAdapter adapter: the adapter which sends the requests
+    :param float budget: the total number of seconds a request may take, including its retries
+    :returns: the adapter or None if requests is not available
+    :rtype: RetryAdapter|None
+    """
+    if not HAS_REQUESTS:
+        return None
+    return RetryAdapter(adapter, RetryPolicy(budget=budget))
+
+
+def __wrap_exit(exit_fn, policies):
+    """
+    Wrap a module's exit_json or fail_json to add the number of retries to its result
+    :param (**kwargs) -> None exit_fn: the function to wrap
+    :param list[(RetryPolicy, int)] policies: the policies and their number of retries when installed
+    :rtype: (**kwargs) -> None
+    """
+    def exit_with_retries(**kwargs):
+        kwargs[RETRIES_RESULT_KEY] = sum(policy.retries - start for policy, start in policies)
+        exit_fn(**kwargs)
+    return exit_with_retries
+
+
+def install_retry_counts(module, policy):
+    """
+    Report the number of retries of a policy during the module as
+    pureport_retries in the module's result.  The module's exit_json and
+    fail_json are only wrapped once, so the retries of every policy the
+    module uses are reported together.
+    :param ansible.module_utils.basic.AnsibleModule module: the Ansible module
+    :param RetryPolicy policy: the retry policy
+    """
+    policies = getattr(module, '_pureport_retry_policies', None)
+    if policies is None:
+        policies = []
+        module._pureport_retry_policies = policies
+        module.exit_json = __wrap_exit(module.exit_json, policies)
+        module.fail_json = __wrap_exit(module.fail_json, policies)
+    if all(policy is not other for other, start in policies):
+        policies.append((policy, policy.retries))
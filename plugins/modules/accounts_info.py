@@ -17,6 +17,7 @@ requirements: [ pureport-client ]
 author: Matt Traynham (@mtraynham)
 extends_documentation_fragment:
     - pureport.pureport.client
+    - pureport.pureport.listing
 '''
 
 EXAMPLES = '''
@@ -89,7 +90,6 @@ accounts:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
 from traceback import format_exc
 
 try:
@@ -100,6 +100,10 @@ from ..module_utils.pureport import \
     get_client_argument_spec, \
     get_client_mutually_exclusive, \
     get_client
+from ..module_utils.pureport_info import \
+    get_listing_argument_spec, \
+    iter_listing, \
+    format_items
 
 
 def find_accounts(module):
@@ -109,15 +113,18 @@ def find_accounts(module):
     """
     client = get_client(module)
     try:
-        accounts = client.accounts.list()
-        module.exit_json(accounts=[camel_dict_to_snake_dict(account) for account in accounts])
+        accounts = iter_listing(client, '/accounts')
+        module.exit_json(accounts=format_items(module, accounts))
     except ClientHttpException as e:
         module.fail_json(msg=e.response.text, exception=format_exc())
+    except ValueError as e:
+        module.fail_json(msg=str(e), exception=format_exc())
 
 
 def main():
     argument_spec = dict()
     argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_listing_argument_spec())
     mutually_exclusive = []
     mutually_exclusive += get_client_mutually_exclusive()
     module = AnsibleModule(
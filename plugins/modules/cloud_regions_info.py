@@ -17,6 +17,7 @@ requirements: [ pureport-client ]
 author: Matt Traynham (@mtraynham)
 extends_documentation_fragment:
     - pureport.pureport.client
+    - pureport.pureport.catalog_cache
 '''
 
 EXAMPLES = '''
@@ -82,6 +83,9 @@ from ..module_utils.pureport import \
     get_client_argument_spec, \
     get_client_mutually_exclusive, \
     get_client
+from ..module_utils.pureport_cache import \
+    get_catalog_cache_argument_spec, \
+    get_cached_catalog
 
 
 def find_cloud_regions(module):
@@ -89,9 +93,8 @@ def find_cloud_regions(module):
     List cloud regions
     :param AnsibleModule module: the ansible module
     """
-    client = get_client(module)
     try:
-        cloud_regions = client.cloud_regions.list()
+        cloud_regions = get_cached_catalog(module, 'cloud_regions', lambda: get_client(module).cloud_regions.list())
         module.exit_json(cloud_regions=[camel_dict_to_snake_dict(cloud_region) for cloud_region in cloud_regions])
     except ClientHttpException as e:
         module.fail_json(msg=e.response.text, exception=format_exc())
@@ -100,6 +103,7 @@ def find_cloud_regions(module):
 def main():
     argument_spec = dict()
     argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_catalog_cache_argument_spec())
     mutually_exclusive = []
     mutually_exclusive += get_client_mutually_exclusive()
     module = AnsibleModule(
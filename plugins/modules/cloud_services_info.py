@@ -17,6 +17,7 @@ requirements: [ pureport-client ]
 author: Matt Traynham (@mtraynham)
 extends_documentation_fragment:
     - pureport.pureport.client
+    - pureport.pureport.catalog_cache
 '''
 
 EXAMPLES = '''
@@ -117,6 +118,9 @@ from ..module_utils.pureport import \
     get_client_argument_spec, \
     get_client_mutually_exclusive, \
     get_client
+from ..module_utils.pureport_cache import \
+    get_catalog_cache_argument_spec, \
+    get_cached_catalog
 
 
 def find_cloud_services(module):
@@ -124,9 +128,8 @@ def find_cloud_services(module):
     List cloud services
     :param AnsibleModule module: the ansible module
     """
-    client = get_client(module)
     try:
-        cloud_services = client.cloud_services.list()
+        cloud_services = get_cached_catalog(module, 'cloud_services', lambda: get_client(module).cloud_services.list())
         module.exit_json(cloud_services=[camel_dict_to_snake_dict(cloud_service) for cloud_service in cloud_services])
     except ClientHttpException as e:
         module.fail_json(msg=e.response.text, exception=format_exc())
@@ -135,6 +138,7 @@ def find_cloud_services(module):
 def main():
     argument_spec = dict()
     argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_catalog_cache_argument_spec())
     mutually_exclusive = []
     mutually_exclusive += get_client_mutually_exclusive()
     module = AnsibleModule(
@@ -0,0 +1,204 @@
+#!/usr/bin/python
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'Pureport'
+}
+
+DOCUMENTATION = '''
+---
+module: connection_status
+short_description: Check the progress of a connection operation which was not waited for
+description:
+    - "Check the progress of a connection's create, update or delete, using the 'job' returned by the
+      connection modules when 'wait_for_server' is 'async'.  The connection is retrieved once with a
+      conditional request, so a connection which has not changed since it was last checked costs a
+      single empty response.  The module fails if the connection entered a state from which it will
+      never reach the expected state."
+version_added: "2.9"
+requirements: [ pureport-client ]
+author: Matt Traynham (@mtraynham)
+options:
+    job:
+        description:
+            - The 'job' returned by a connection module, or by a previous check of this module.
+        required: true
+        type: dict
+        suboptions:
+            href:
+                description:
+                    - The href of the connection.
+                required: true
+                type: str
+            expected_state:
+                description:
+                    - The state the connection is expected to reach.  Deleted connections are
+                    - those which no longer exist.
+                required: false
+                type: str
+                choices: ['ACTIVE', 'DELETED']
+                default: ACTIVE
+            state:
+                description:
+                    - The last seen state of the connection.
+                required: false
+                type: str
+            etag:
+                description:
+                    - The ETag of the connection when it was last seen.
+                required: false
+                type: str
+extends_documentation_fragment:
+    - pureport.pureport.client
+'''
+
+EXAMPLES = '''
+- name: Create a Site IPSec VPN connection without waiting for it
+  site_ipsec_vpn_connection:
+    api_key: XXXXXXXXXXXXX
+    api_secret: XXXXXXXXXXXXXXXXX
+    network_href: /networks/network-XXXXXXXXXXXXXXXXXXXXXX
+    name: My Site IPSec VPN Connection
+    speed: 50
+    location_href: /locations/XX-XXX
+    billing_term: HOURLY
+    primary_customer_router_ip: a.b.c.d
+    routing_type: ROUTE_BASED_BGP
+    customer_asn: ######
+    ike_version: V2
+    ike_encryption: AES_256
+    ike_prf: SHA_256
+    ike_dh_group: MODP_2048
+    esp_encryption: AES_256_GCM_128
+    esp_dh_group: MODP_2048
+    wait_for_server: async
+  register: result  # Registers result.job
+
+# ... other tasks run while the connection is provisioned ...
+
+- name: Wait for the connection to become active
+  connection_status:
+    api_key: XXXXXXXXXXXXX
+    api_secret: XXXXXXXXXXXXXXXXX
+    job: "{{ result.job }}"
+  register: status
+  until: status.done
+  retries: 60
+  delay: 10
+'''
+
+RETURN = '''
+done:
+    description:
+        - If the connection reached the expected state.
+    returned: always
+    type: bool
+modified:
+    description:
+        - If the connection changed since the job was last checked.
+    returned: always
+    type: bool
+state:
+    description:
+        - The state of the connection, which is DELETED if it no longer exists.
+    returned: always
+    type: str
+job:
+    description:
+        - The job, updated with the connection's current state, to pass to later checks.
+    returned: always
+    type: dict
+connection:
+    description:
+        - The connection, if it was modified since the job was last checked.
+    returned: when modified
+    type: Connection
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
+from traceback import format_exc
+
+try:
+    from pureport.exception.api import ClientHttpException, NotFoundException
+except ImportError:
+    ClientHttpException = None
+    NotFoundException = None
+from ..module_utils.pureport import \
+    get_client_argument_spec, \
+    get_client_mutually_exclusive, \
+    get_client, \
+    get_client_session
+from ..module_utils.pureport_connection_crud import \
+    CONNECTION_FAILED_STATES
+
+
+def check_connection_status(module):
+    """
+    Check the status of a connection's job
+    :param AnsibleModule module: the ansible module
+    """
+    client = get_client(module)
+    job = module.params.get('job')
+    headers = dict()
+    if job.get('etag') is not None:
+        headers['If-None-Match'] = job.get('etag')
+
+    connection = None
+    state = job.get('state')
+    etag = job.get('etag')
+    try:
+        response = get_client_session(client).get(job.get('href'), headers=headers)
+        if response.status_code != 304:
+            connection = response.json()
+            state = connection.get('state')
+            etag = response.headers.get('ETag')
+    except NotFoundException:
+        state = 'DELETED'
+        etag = None
+    except ClientHttpException as e:
+        module.fail_json(msg=e.response.text, exception=format_exc())
+
+    result = dict(
+        changed=False,
+        done=state == job.get('expected_state'),
+        modified=state != job.get('state') or connection is not None,
+        state=state,
+        job=dict(job, state=state, etag=etag)
+    )
+    if connection is not None:
+        result['connection'] = camel_dict_to_snake_dict(connection)
+    if state in CONNECTION_FAILED_STATES[job.get('expected_state')]:
+        module.fail_json(msg="Connection entered the %s state while waiting for it "
+                             "to become %s." % (state, job.get('expected_state')),
+                         **result)
+    module.exit_json(**result)
+
+
+def main():
+    argument_spec = dict()
+    argument_spec.update(get_client_argument_spec())
+    argument_spec.update(dict(
+        job=dict(
+            type='dict',
+            required=True,
+            options=dict(
+                href=dict(type='str', required=True),
+                expected_state=dict(type='str', choices=['ACTIVE', 'DELETED'], default='ACTIVE'),
+                state=dict(type='str'),
+                etag=dict(type='str')
+            )
+        )
+    ))
+    mutually_exclusive = []
+    mutually_exclusive += get_client_mutually_exclusive()
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=mutually_exclusive
+    )
+    check_connection_status(module)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/python
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'Pureport'
+}
+
+DOCUMENTATION = '''
+---
+module: connections
+short_description: Create, update or delete many connections of a network in a single task
+description:
+    - "Create, update or delete many connections of a network in a single task.  The network's connections
+      are listed once and every provided connection is compared against them, after which all creates,
+      updates and deletes are sent concurrently."
+version_added: "2.9"
+requirements: [ pureport-client ]
+author: Matt Traynham (@mtraynham)
+options:
+    network_href:
+        required: true
+    connections:
+        description:
+            - A list of Connection (dict) objects, in the same form as returned by the connection modules
+              or 'connections_info' (e.g dict(name=str, type=str, speed=int, location=dict(href=str), ...)).
+            - Each connection may provide a 'connection_state' key, either 'present' or 'absent', which defaults
+              to 'present'.  The 'state' key of connections returned by the API (e.g ACTIVE) is ignored.
+            - Connections are matched with existing connections by their 'id', or if 'resolve_existing' is
+              set, by their 'name' and 'type'.
+        required: true
+        type: list
+    parallelism:
+        description:
+            - The maximum number of connections created, updated or deleted concurrently.
+        required: false
+        type: int
+        default: 10
+extends_documentation_fragment:
+    - pureport.pureport.client
+    - pureport.pureport.network
+    - pureport.pureport.resolve_existing
+    - pureport.pureport.partial_update
+    - pureport.pureport.wait_for_server
+'''
+
+EXAMPLES = '''
+- name: Create or update a set of Site IPSec VPN connections for a network
+  connections:
+    api_key: XXXXXXXXXXXXX
+    api_secret: XXXXXXXXXXXXXXXXX
+    network_href: /networks/network-XXXXXXXXXXXXXXXXXXXXXX
+    wait_for_server: true  # Wait for the server to finish provisioning all connections
+    connections:
+      - name: My Site IPSec VPN Connection 1
+        type: SITE_IPSEC_VPN
+        speed: 50
+        location:
+          href: /locations/XX-XXX
+        billing_term: HOURLY
+        auth_type: PSK
+        routing_type: ROUTE_BASED_BGP
+        primary_customer_router_ip: a.b.c.d
+        ike_v2:
+          ike:
+            encryption: AES_256
+            prf: SHA_256
+            dh_group: MODP_2048
+          esp:
+            encryption: AES_256_GCM_128
+            dh_group: MODP_2048
+      - name: My Site IPSec VPN Connection 2
+        type: SITE_IPSEC_VPN
+        speed: 50
+        location:
+          href: /locations/XX-XXX
+        billing_term: HOURLY
+        auth_type: PSK
+        routing_type: ROUTE_BASED_BGP
+        primary_customer_router_ip: e.f.g.h
+        ike_v2:
+          ike:
+            encryption: AES_256
+            prf: SHA_256
+            dh_group: MODP_2048
+          esp:
+            encryption: AES_256_GCM_128
+            dh_group: MODP_2048
+  register: result  # Registers result.results
+
+- name: Delete one of the connections using the 'absent' connection_state
+  connections:
+    api_key: XXXXXXXXXXXXX
+    api_secret: XXXXXXXXXXXXXXXXX
+    network_href: /networks/network-XXXXXXXXXXXXXXXXXXXXXX
+    connections:
+      - id: "{{ result.results[0].connection.id }}"
+        connection_state: absent
+'''
+
+RETURN = '''
+results:
+    description:
+        - A result per provided connection, in the order they were provided.
+    returned: always
+    type: complex
+    contains:
+        changed:
+            description:
+                - If the connection was created, updated or deleted.
+            returned: always
+            type: bool
+        connection:
+            description:
+                - The created, updated, deleted or unchanged connection.
+            returned: always
+            type: Connection
+        differences:
+            description:
+                - The paths of the connection's fields which were updated (e.g nat.mappings[2].nativeCidr).
+            returned: when the connection was updated
+            type: list
+        job:
+            description:
+                - A token for the connection's operation, which can be checked with the 'connection_status' module.
+            returned: when wait_for_server is async and the connection changed
+            type: dict
+        msg:
+            description:
+                - The error message if the connection failed to be reconciled.
+            returned: failure
+            type: str
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ..module_utils.pureport import \
+    get_client_argument_spec, \
+    get_client_mutually_exclusive, \
+    get_network_argument_spec
+from ..module_utils.pureport_crud import \
+    get_resolve_existing_argument_spec, \
+    get_partial_update_argument_spec
+from ..module_utils.pureport_connection_crud import \
+    get_wait_for_server_argument_spec, \
+    get_connections_argument_spec, \
+    connections_crud
+
+
+def main():
+    argument_spec = dict()
+    argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_network_argument_spec(True))
+    argument_spec.update(get_resolve_existing_argument_spec())
+    argument_spec.update(get_partial_update_argument_spec())
+    argument_spec.update(get_wait_for_server_argument_spec())
+    argument_spec.update(get_connections_argument_spec())
+    mutually_exclusive = []
+    mutually_exclusive += get_client_mutually_exclusive()
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=mutually_exclusive,
+        supports_check_mode=True
+    )
+    changed, results, diff = connections_crud(module)
+    module.exit_json(
+        changed=changed,
+        diff=diff,
+        results=results
+    )
+
+
+if __name__ == '__main__':
+    main()
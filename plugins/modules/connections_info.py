@@ -30,6 +30,8 @@ extends_documentation_fragment:
     - pureport.pureport.client
     - pureport.pureport.account
     - pureport.pureport.network
+    - pureport.pureport.filters
+    - pureport.pureport.listing
 '''
 
 EXAMPLES = '''
@@ -47,6 +49,17 @@ EXAMPLES = '''
     network_href: /networks/network-XXXXXXXXXXXXXXXXXXXXXX
   register: result   # Registers result.connections
 
+- name: List the ids and names of a network's active AWS connections
+  connections_info:
+    api_key: XXXXXXXXXXXXX
+    api_secret: XXXXXXXXXXXXXXXXX
+    network_href: /networks/network-XXXXXXXXXXXXXXXXXXXXXX
+    filters:
+      state: [ACTIVE]
+      type: [AWS_DIRECT_CONNECT]
+    fields: [id, name]
+  register: result   # Registers result.connections
+
 - name: Display all connection hrefs using a json_query filter
   debug:
     var: item
@@ -60,7 +73,6 @@ connections:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
 from traceback import format_exc
 
 try:
@@ -75,6 +87,11 @@ from ..module_utils.pureport import \
     get_account, \
     get_network_argument_spec, \
     get_network
+from ..module_utils.pureport_info import \
+    get_filters_argument_spec, \
+    get_listing_argument_spec, \
+    iter_listing, \
+    format_items
 
 
 def find_connections(module):
@@ -87,28 +104,27 @@ def find_connections(module):
     connections = None
     # Retrieve connections from the account
     if module.params.get('account_href') is not None:
-        account = get_account(module)
-        try:
-            connections = client.accounts.connections(account).list()
-        except ClientHttpException as e:
-            module.fail_json(msg=e.response.text, exception=format_exc())
+        connections = iter_listing(client, '%s/connections' % get_account(module)['href'])
     # Retrieve connections from the network
     elif module.params.get('network_href') is not None:
-        network = get_network(module)
-        try:
-            connections = client.networks.connections(network).list()
-        except ClientHttpException as e:
-            module.fail_json(msg=e.response.text, exception=format_exc())
+        connections = iter_listing(client, '%s/connections' % get_network(module)['href'])
     else:
         module.fail_json(msg='One of account_href or network_href '
                              'arguments should be provided.')
 
-    module.exit_json(connections=[camel_dict_to_snake_dict(connection) for connection in connections])
+    try:
+        module.exit_json(connections=format_items(module, connections))
+    except ClientHttpException as e:
+        module.fail_json(msg=e.response.text, exception=format_exc())
+    except ValueError as e:
+        module.fail_json(msg=str(e), exception=format_exc())
 
 
 def main():
     argument_spec = dict()
     argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_listing_argument_spec())
+    argument_spec.update(get_filters_argument_spec())
     argument_spec.update(get_account_argument_spec())
     argument_spec.update(get_network_argument_spec())
     mutually_exclusive = []
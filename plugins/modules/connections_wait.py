@@ -0,0 +1,185 @@
+#!/usr/bin/python
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'Pureport'
+}
+
+DOCUMENTATION = '''
+---
+module: connections_wait
+short_description: Wait for many connections to become active or deleted
+description:
+    - "Wait for many connections to become active or deleted at the same time, such as connections created
+      or deleted by the connection modules without 'wait_for_server'.  All connections are polled concurrently,
+      each using a backoff which resets whenever its state changes, and the module returns as soon as every
+      connection reached the expected state."
+version_added: "2.9"
+requirements: [ pureport-client ]
+author: Matt Traynham (@mtraynham)
+options:
+    connection_hrefs:
+        description:
+            - The hrefs of the connections to wait for (e.g /connections/conn-XXXXXXXXXXXXXXXXXXXXXX).
+        required: true
+        type: list
+    expected_state:
+        description:
+            - The state to wait for.  Deleted connections are those which no longer exist.
+        required: false
+        type: str
+        choices: ['ACTIVE', 'DELETED']
+        default: ACTIVE
+    timeout:
+        description:
+            - The maximum number of seconds to wait for all connections.
+        required: false
+        type: int
+        default: 600
+    parallelism:
+        description:
+            - The maximum number of connections polled concurrently.
+        required: false
+        type: int
+        default: 10
+extends_documentation_fragment:
+    - pureport.pureport.client
+'''
+
+EXAMPLES = '''
+- name: Create a set of Site IPSec VPN connections without waiting for each one
+  site_ipsec_vpn_connection:
+    api_key: XXXXXXXXXXXXX
+    api_secret: XXXXXXXXXXXXXXXXX
+    network_href: /networks/network-XXXXXXXXXXXXXXXXXXXXXX
+    name: "My Site IPSec VPN Connection {{ item }}"
+    speed: 50
+    location_href: /locations/XX-XXX
+    billing_term: HOURLY
+    primary_customer_router_ip: "{{ item }}"
+    routing_type: ROUTE_BASED_BGP
+    customer_asn: ######
+    ike_version: V2
+    ike_encryption: AES_256
+    ike_prf: SHA_256
+    ike_dh_group: MODP_2048
+    esp_encryption: AES_256_GCM_128
+    esp_dh_group: MODP_2048
+  loop: "{{ customer_router_ips }}"
+  register: result
+
+- name: Wait for all of the connections to become active
+  connections_wait:
+    api_key: XXXXXXXXXXXXX
+    api_secret: XXXXXXXXXXXXXXXXX
+    connection_hrefs: "{{ result.results | map(attribute='href') | list }}"
+    timeout: 1800
+  register: result  # Registers result.results
+'''
+
+RETURN = '''
+results:
+    description:
+        - A result per provided connection href, in the order they were provided.
+    returned: always
+    type: complex
+    contains:
+        href:
+            description:
+                - The href of the connection.
+            returned: always
+            type: str
+        state:
+            description:
+                - The last seen state of the connection, which is DELETED if it no longer exists.
+            returned: always
+            type: str
+        elapsed:
+            description:
+                - The number of seconds it took the connection to reach the expected state.
+            returned: success
+            type: float
+        polls:
+            description:
+                - The number of times the connection was retrieved.
+            returned: always
+            type: int
+        connection:
+            description:
+                - The last retrieved connection.
+            returned: always
+            type: Connection
+        msg:
+            description:
+                - The reason the connection did not reach the expected state.
+            returned: failure
+            type: str
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
+
+from ..module_utils.pureport import \
+    get_client_argument_spec, \
+    get_client_mutually_exclusive, \
+    get_client
+from ..module_utils.pureport_connection_crud import \
+    CONNECTION_WAIT_TIMEOUT, \
+    wait_for_connections
+
+
+def wait_connections(module):
+    """
+    Wait for the connections to reach the expected state
+    :param AnsibleModule module: the ansible module
+    """
+    client = get_client(module)
+    expected_state = module.params.get('expected_state')
+    wait_results = wait_for_connections(
+        client,
+        [(dict(href=href), expected_state) for href in module.params.get('connection_hrefs')],
+        timeout=module.params.get('timeout'),
+        parallelism=module.params.get('parallelism')
+    )
+
+    results = []
+    errors = []
+    for href, wait_result in zip(module.params.get('connection_hrefs'), wait_results):
+        result = dict(
+            href=href,
+            state=wait_result['state'],
+            elapsed=wait_result['elapsed'],
+            polls=wait_result['polls'],
+            connection=camel_dict_to_snake_dict(wait_result['connection'])
+        )
+        if 'msg' in wait_result:
+            result['msg'] = wait_result['msg']
+            errors.append("%s: %s" % (href, wait_result['msg']))
+        results.append(result)
+    if len(errors) > 0:
+        module.fail_json(msg="%d connection(s) did not become %s.  %s" % (len(errors), expected_state, '  '.join(errors)),
+                         results=results)
+    module.exit_json(results=results)
+
+
+def main():
+    argument_spec = dict()
+    argument_spec.update(get_client_argument_spec())
+    argument_spec.update(dict(
+        connection_hrefs=dict(type='list', required=True),
+        expected_state=dict(type='str', choices=['ACTIVE', 'DELETED'], default='ACTIVE'),
+        timeout=dict(type='int', default=CONNECTION_WAIT_TIMEOUT),
+        parallelism=dict(type='int', default=10)
+    ))
+    mutually_exclusive = []
+    mutually_exclusive += get_client_mutually_exclusive()
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=mutually_exclusive
+    )
+    wait_connections(module)
+
+
+if __name__ == '__main__':
+    main()
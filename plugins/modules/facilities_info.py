@@ -17,6 +17,7 @@ requirements: [ pureport-client ]
 author: Matt Traynham (@mtraynham)
 extends_documentation_fragment:
     - pureport.pureport.client
+    - pureport.pureport.catalog_cache
 '''
 
 EXAMPLES = '''
@@ -129,6 +130,9 @@ from ..module_utils.pureport import \
     get_client_argument_spec, \
     get_client_mutually_exclusive, \
     get_client
+from ..module_utils.pureport_cache import \
+    get_catalog_cache_argument_spec, \
+    get_cached_catalog
 
 
 def __format_facility(facility):
@@ -149,9 +153,8 @@ def find_facilities(module):
     List facilities
     :param AnsibleModule module: the ansible module
     """
-    client = get_client(module)
     try:
-        facilities = client.facilities.list()
+        facilities = get_cached_catalog(module, 'facilities', lambda: get_client(module).facilities.list())
 
         module.exit_json(facilities=[__format_facility(facility) for facility in facilities])
     except ClientHttpException as e:
@@ -161,6 +164,7 @@ def find_facilities(module):
 def main():
     argument_spec = dict()
     argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_catalog_cache_argument_spec())
     mutually_exclusive = []
     mutually_exclusive += get_client_mutually_exclusive()
     module = AnsibleModule(
@@ -17,6 +17,7 @@ requirements: [ pureport-client ]
 author: Matt Traynham (@mtraynham)
 extends_documentation_fragment:
     - pureport.pureport.client
+    - pureport.pureport.catalog_cache
 '''
 
 EXAMPLES = '''
@@ -112,6 +113,9 @@ from ..module_utils.pureport import \
     get_client_argument_spec, \
     get_client_mutually_exclusive, \
     get_client
+from ..module_utils.pureport_cache import \
+    get_catalog_cache_argument_spec, \
+    get_cached_catalog
 
 
 def find_locations(module):
@@ -119,9 +123,8 @@ def find_locations(module):
     List locations
     :param AnsibleModule module: the ansible module
     """
-    client = get_client(module)
     try:
-        locations = client.locations.list()
+        locations = get_cached_catalog(module, 'locations', lambda: get_client(module).locations.list())
         module.exit_json(locations=[camel_dict_to_snake_dict(location) for location in locations])
     except ClientHttpException as e:
         module.fail_json(msg=e.response.text, exception=format_exc())
@@ -130,6 +133,7 @@ def find_locations(module):
 def main():
     argument_spec = dict()
     argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_catalog_cache_argument_spec())
     mutually_exclusive = []
     mutually_exclusive += get_client_mutually_exclusive()
     module = AnsibleModule(
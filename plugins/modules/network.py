@@ -38,6 +38,8 @@ extends_documentation_fragment:
     - pureport.pureport.account
     - pureport.pureport.state
     - pureport.pureport.resolve_existing
+    - pureport.pureport.partial_update
+    - pureport.pureport.existing
 '''
 
 EXAMPLES = '''
@@ -111,10 +113,14 @@ from ..module_utils.pureport import \
     get_client_mutually_exclusive, \
     get_client, \
     get_account_argument_spec, \
-    get_account
+    get_account, \
+    patch_item
 from ..module_utils.pureport_crud import \
     get_state_argument_spec, \
     get_resolve_existing_argument_spec, \
+    get_partial_update_argument_spec, \
+    get_existing_argument_spec, \
+    find_indexed_items, \
     item_crud
 
 
@@ -159,10 +165,10 @@ def resolve_network(module, client, network):
     account = get_account(module)
     if account is not None:
         try:
-            existing_networks = client.accounts.networks(account).list()
-            matched_networks = [existing_network for existing_network in existing_networks
-                                if all([existing_network.get(k) == network.get(k)
-                                        for k in ['name']])]
+            matched_networks = find_indexed_items('%s/networks' % account['href'],
+                                                  lambda: client.accounts.networks(account).list(),
+                                                  ('name',),
+                                                  network)
             if len(matched_networks) == 1:
                 return matched_networks[0]
             elif len(matched_networks) > 1:
@@ -222,6 +228,25 @@ def update_network(module, client, network):
         module.fail_json(msg=e.response.text, exception=format_exc())
 
 
+def patch_network(module, client, network, patch):
+    """
+    Partially update a network, falling back to a full update if the API does
+    not support it
+    :param AnsibleModule module: the Ansible module
+    :param pureport.api.client.Client client: the Pureport client
+    :param Network network: the Ansible inferred Network
+    :param dict patch: the changed fields of the network
+    :rtype: Network
+    """
+    try:
+        patched_network = patch_item(client, network, patch)
+    except ClientHttpException as e:
+        module.fail_json(msg=e.response.text, exception=format_exc())
+    if patched_network is None:
+        return update_network(module, client, network)
+    return patched_network
+
+
 def delete_network(module, client, network):
     """
     Delete a network
@@ -243,6 +268,8 @@ def main():
     argument_spec.update(get_account_argument_spec(True))
     argument_spec.update(get_state_argument_spec())
     argument_spec.update(get_resolve_existing_argument_spec())
+    argument_spec.update(get_partial_update_argument_spec())
+    argument_spec.update(get_existing_argument_spec())
     argument_spec.update(
         dict(
             id=dict(type='str'),
@@ -263,7 +290,8 @@ def main():
         changed,
         changed_network,
         argument_network,
-        existing_network
+        existing_network,
+        diff
     ) = item_crud(
         module,
         partial(construct_network, module),
@@ -272,10 +300,12 @@ def main():
         partial(create_network, module, client),
         partial(update_network, module, client),
         partial(delete_network, module, client),
-        copy_existing_item_properties_fn=copy_existing_network_properties
+        copy_existing_item_properties_fn=copy_existing_network_properties,
+        patch_item_fn=partial(patch_network, module, client)
     )
     module.exit_json(
         changed=changed,
+        diff=diff,
         **camel_dict_to_snake_dict(changed_network)
     )
 
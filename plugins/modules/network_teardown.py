@@ -0,0 +1,197 @@
+#!/usr/bin/python
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'Pureport'
+}
+
+DOCUMENTATION = '''
+---
+module: network_teardown
+short_description: Delete a network along with all of its connections
+description:
+    - "Delete every connection of a network concurrently, wait for all of the deletions together in a single
+      polling loop, and then delete the network.  Connections which are already being deleted are only waited
+      for.  If any connection fails to be deleted, the network is kept."
+version_added: "2.9"
+requirements: [ pureport-client ]
+author: Matt Traynham (@mtraynham)
+options:
+    timeout:
+        description:
+            - The maximum number of seconds to wait for all connections to be deleted.
+        required: false
+        type: int
+        default: 600
+    parallelism:
+        description:
+            - The maximum number of connections deleted or polled concurrently.
+        required: false
+        type: int
+        default: 10
+    delete_network:
+        description:
+            - Delete the network once all of its connections are deleted.
+        required: false
+        type: bool
+        default: true
+extends_documentation_fragment:
+    - pureport.pureport.client
+    - pureport.pureport.network
+'''
+
+EXAMPLES = '''
+- name: Tear down a lab network
+  network_teardown:
+    api_key: XXXXXXXXXXXXX
+    api_secret: XXXXXXXXXXXXXXXXX
+    network_href: /networks/network-XXXXXXXXXXXXXXXXXXXXXX
+    timeout: 1800
+  register: result  # Registers result.results
+'''
+
+RETURN = '''
+results:
+    description:
+        - A result per connection of the network.
+    returned: always
+    type: complex
+    contains:
+        href:
+            description:
+                - The href of the connection.
+            returned: always
+            type: str
+        name:
+            description:
+                - The name of the connection.
+            returned: always
+            type: str
+        state:
+            description:
+                - The last seen state of the connection, which is DELETED if it no longer exists.
+            returned: always
+            type: str
+        elapsed:
+            description:
+                - The number of seconds it took the connection to be deleted.
+            returned: success
+            type: float
+        msg:
+            description:
+                - The reason the connection was not deleted.
+            returned: failure
+            type: str
+network_deleted:
+    description:
+        - If the network was deleted.
+    returned: always
+    type: bool
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from traceback import format_exc
+
+try:
+    from pureport.exception.api import ClientHttpException, NotFoundException
+except ImportError:
+    ClientHttpException = None
+    NotFoundException = None
+from ..module_utils.pureport import \
+    get_client_argument_spec, \
+    get_client_mutually_exclusive, \
+    get_client, \
+    get_network_argument_spec, \
+    get_network
+from ..module_utils.pureport_connection_crud import \
+    CONNECTION_WAIT_TIMEOUT, \
+    apply_connection_operations, \
+    wait_for_connections
+
+
+def teardown_network(module):
+    """
+    Delete the connections of a network, then the network
+    :param AnsibleModule module: the ansible module
+    """
+    client = get_client(module)
+    network = get_network(module)
+    parallelism = module.params.get('parallelism')
+    delete_network = module.params.get('delete_network')
+    try:
+        connections = client.networks.connections(network).list()
+    except NotFoundException:
+        module.exit_json(changed=False, results=[], network_deleted=False)
+    except ClientHttpException as e:
+        module.fail_json(msg=e.response.text, exception=format_exc())
+
+    results = [dict(href=connection['href'], name=connection.get('name'), state=connection.get('state'))
+               for connection in connections]
+    if module.check_mode:
+        module.exit_json(changed=len(connections) > 0 or delete_network, results=results, network_deleted=delete_network)
+
+    # Connections which are already being deleted are only waited for
+    deleted_connections = [connection for connection in connections if connection.get('state') != 'DELETING']
+    applied_operations = apply_connection_operations(client,
+                                                     network,
+                                                     [('delete', connection, None) for connection in deleted_connections],
+                                                     parallelism)
+    errors = dict((connection['href'], error)
+                  for connection, (applied_connection, error) in zip(deleted_connections, applied_operations)
+                  if error is not None)
+
+    waited = [i for i, connection in enumerate(connections) if connection['href'] not in errors]
+    wait_results = wait_for_connections(client,
+                                        [(connections[i], 'DELETED') for i in waited],
+                                        timeout=module.params.get('timeout'),
+                                        parallelism=parallelism)
+    for i, wait_result in zip(waited, wait_results):
+        results[i]['state'] = wait_result['state']
+        results[i]['elapsed'] = wait_result['elapsed']
+        results[i]['polls'] = wait_result['polls']
+        if 'msg' in wait_result:
+            errors[connections[i]['href']] = wait_result['msg']
+    for result in results:
+        if result['href'] in errors:
+            result['msg'] = errors[result['href']]
+
+    if len(errors) > 0:
+        module.fail_json(msg="Failed to delete %d connection(s), so the network was not deleted.  %s" %
+                             (len(errors), '  '.join("%s: %s" % (href, error) for href, error in errors.items())),
+                         changed=len(errors) < len(connections),
+                         results=results,
+                         network_deleted=False)
+
+    if delete_network:
+        try:
+            client.networks.delete(network)
+        except NotFoundException:
+            delete_network = False
+        except ClientHttpException as e:
+            module.fail_json(msg=e.response.text, exception=format_exc(), changed=len(connections) > 0,
+                             results=results, network_deleted=False)
+    module.exit_json(changed=len(connections) > 0 or delete_network, results=results, network_deleted=delete_network)
+
+
+def main():
+    argument_spec = dict()
+    argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_network_argument_spec(True))
+    argument_spec.update(dict(
+        timeout=dict(type='int', default=CONNECTION_WAIT_TIMEOUT),
+        parallelism=dict(type='int', default=10),
+        delete_network=dict(type='bool', default=True)
+    ))
+    mutually_exclusive = []
+    mutually_exclusive += get_client_mutually_exclusive()
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=mutually_exclusive,
+        supports_check_mode=True
+    )
+    teardown_network(module)
+
+
+if __name__ == '__main__':
+    main()
@@ -21,6 +21,8 @@ options:
 extends_documentation_fragment:
     - pureport.pureport.client
     - pureport.pureport.account
+    - pureport.pureport.filters
+    - pureport.pureport.listing
 '''
 
 EXAMPLES = '''
@@ -70,7 +72,6 @@ networks:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
 from traceback import format_exc
 
 try:
@@ -83,6 +84,11 @@ from ..module_utils.pureport import \
     get_client, \
     get_account_argument_spec, \
     get_account
+from ..module_utils.pureport_info import \
+    get_filters_argument_spec, \
+    get_listing_argument_spec, \
+    iter_listing, \
+    format_items
 
 
 def find_networks(module):
@@ -93,15 +99,19 @@ def find_networks(module):
     client = get_client(module)
     account = get_account(module)
     try:
-        networks = client.accounts.networks(account).list()
-        module.exit_json(networks=[camel_dict_to_snake_dict(network) for network in networks])
+        networks = iter_listing(client, '%s/networks' % account['href'])
+        module.exit_json(networks=format_items(module, networks))
     except ClientHttpException as e:
         module.fail_json(msg=e.response.text, exception=format_exc())
+    except ValueError as e:
+        module.fail_json(msg=str(e), exception=format_exc())
 
 
 def main():
     argument_spec = dict()
     argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_listing_argument_spec())
+    argument_spec.update(get_filters_argument_spec())
     argument_spec.update(get_account_argument_spec(True))
     mutually_exclusive = []
     mutually_exclusive += get_client_mutually_exclusive()
@@ -27,6 +27,7 @@ options:
         default: []
 extends_documentation_fragment:
     - pureport.pureport.client
+    - pureport.pureport.catalog_cache
 '''
 
 EXAMPLES = '''
@@ -106,6 +107,9 @@ from ..module_utils.pureport import \
     get_client_argument_spec, \
     get_client_mutually_exclusive, \
     get_client
+from ..module_utils.pureport_cache import \
+    get_catalog_cache_argument_spec, \
+    get_cached_catalog
 
 
 def find_options(module):
@@ -113,9 +117,12 @@ def find_options(module):
     List options
     :param AnsibleModule module: the ansible module
     """
-    client = get_client(module)
+    types = module.params.get('types')
     try:
-        options = client.options.list(*module.params.get('types'))
+        options = get_cached_catalog(module,
+                                     'options',
+                                     lambda: get_client(module).options.list(*types),
+                                     dict(types=types))
         module.exit_json(options=options)
     except ClientHttpException as e:
         module.fail_json(msg=e.response.text, exception=format_exc())
@@ -124,6 +131,7 @@ def find_options(module):
 def main():
     argument_spec = dict()
     argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_catalog_cache_argument_spec())
     argument_spec.update(dict(
         types=dict(
             type="list",
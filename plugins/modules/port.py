@@ -61,6 +61,8 @@ extends_documentation_fragment:
     - pureport.pureport.account
     - pureport.pureport.state
     - pureport.pureport.resolve_existing
+    - pureport.pureport.partial_update
+    - pureport.pureport.existing
 '''
 
 EXAMPLES = '''
@@ -234,10 +236,14 @@ from ..module_utils.pureport import \
     get_client_mutually_exclusive, \
     get_client, \
     get_account_argument_spec, \
-    get_account
+    get_account, \
+    patch_item
 from ..module_utils.pureport_crud import \
     get_state_argument_spec, \
     get_resolve_existing_argument_spec, \
+    get_partial_update_argument_spec, \
+    get_existing_argument_spec, \
+    find_indexed_items, \
     item_crud
 
 
@@ -291,10 +297,10 @@ def resolve_port(module, client, port):
     account = get_account(module)
     if account is not None:
         try:
-            existing_ports = client.accounts.ports(account).list()
-            matched_ports = [existing_port for existing_port in existing_ports
-                             if all([existing_port.get(k) == port.get(k)
-                                     for k in ['name']])]
+            matched_ports = find_indexed_items('%s/ports' % account['href'],
+                                               lambda: client.accounts.ports(account).list(),
+                                               ('name',),
+                                               port)
             if len(matched_ports) == 1:
                 return matched_ports[0]
             elif len(matched_ports) > 1:
@@ -353,6 +359,25 @@ def update_port(module, client, port):
         module.fail_json(msg=e.response.text, exception=format_exc())
 
 
+def patch_port(module, client, port, patch):
+    """
+    Partially update a port, falling back to a full update if the API does
+    not support it
+    :param AnsibleModule module: the Ansible module
+    :param pureport.api.client.Client client: the Pureport client
+    :param Port port: the Ansible inferred Port
+    :param dict patch: the changed fields of the port
+    :rtype: Port
+    """
+    try:
+        patched_port = patch_item(client, port, patch)
+    except ClientHttpException as e:
+        module.fail_json(msg=e.response.text, exception=format_exc())
+    if patched_port is None:
+        return update_port(module, client, port)
+    return patched_port
+
+
 def delete_port(module, client, port):
     """
     Delete a port
@@ -373,6 +398,8 @@ def main():
     argument_spec.update(get_account_argument_spec(True))
     argument_spec.update(get_state_argument_spec())
     argument_spec.update(get_resolve_existing_argument_spec())
+    argument_spec.update(get_partial_update_argument_spec())
+    argument_spec.update(get_existing_argument_spec())
     argument_spec.update(
         dict(
             facility_href=dict(type='str', required=True),
@@ -399,7 +426,8 @@ def main():
         changed,
         changed_port,
         argument_port,
-        existing_port
+        existing_port,
+        diff
     ) = item_crud(
         module,
         partial(construct_port, module),
@@ -408,10 +436,12 @@ def main():
         partial(create_port, module, client),
         partial(update_port, module, client),
         partial(delete_port, module, client),
-        copy_existing_item_properties_fn=copy_existing_port_properties
+        copy_existing_item_properties_fn=copy_existing_port_properties,
+        patch_item_fn=partial(patch_port, module, client)
     )
     module.exit_json(
         changed=changed,
+        diff=diff,
         **camel_dict_to_snake_dict(changed_port)
     )
 
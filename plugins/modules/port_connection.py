@@ -43,6 +43,8 @@ extends_documentation_fragment:
     - pureport.pureport.network
     - pureport.pureport.state
     - pureport.pureport.resolve_existing
+    - pureport.pureport.partial_update
+    - pureport.pureport.existing
     - pureport.pureport.wait_for_server
     - pureport.pureport.connection_args
 '''
@@ -54,6 +56,11 @@ RETURN = '''
 connection:
     description: the created, updated, or deleted connection
     type: Connection
+job:
+    description:
+        - A token for the connection's operation, which can be checked with the 'connection_status' module.
+    returned: when wait_for_server is async
+    type: dict
 '''
 
 from functools import partial
@@ -68,11 +75,14 @@ from ..module_utils.pureport import \
     get_network_argument_spec
 from ..module_utils.pureport_crud import \
     get_state_argument_spec, \
-    get_resolve_existing_argument_spec
+    get_resolve_existing_argument_spec, \
+    get_partial_update_argument_spec, \
+    get_existing_argument_spec
 from ..module_utils.pureport_connection_crud import \
     get_wait_for_server_argument_spec, \
     get_connection_argument_spec, \
     get_cloud_connection_argument_spec, \
+    get_connection_job, \
     connection_crud
 
 
@@ -122,6 +132,8 @@ def main():
     argument_spec.update(get_network_argument_spec(True))
     argument_spec.update(get_state_argument_spec())
     argument_spec.update(get_resolve_existing_argument_spec())
+    argument_spec.update(get_partial_update_argument_spec())
+    argument_spec.update(get_existing_argument_spec())
     argument_spec.update(get_wait_for_server_argument_spec())
     argument_spec.update(get_connection_argument_spec())
     argument_spec.update(get_cloud_connection_argument_spec())
@@ -144,13 +156,16 @@ def main():
         changed,
         changed_connection,
         argument_connection,
-        existing_connection
+        existing_connection,
+        diff
     ) = connection_crud(
         module,
         partial(construct_connection, module)
     )
     module.exit_json(
         changed=changed,
+        diff=diff,
+        job=get_connection_job(module, changed_connection),
         **camel_dict_to_snake_dict(changed_connection)
     )
 
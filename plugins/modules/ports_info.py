@@ -22,6 +22,8 @@ extends_documentation_fragment:
     - pureport.pureport.client
     - pureport.pureport.account
     - pureport.pureport.account
+    - pureport.pureport.filters
+    - pureport.pureport.listing
 '''
 
 EXAMPLES = '''
@@ -154,7 +156,6 @@ ports:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
 from traceback import format_exc
 
 try:
@@ -167,6 +168,11 @@ from ..module_utils.pureport import \
     get_client, \
     get_account_argument_spec, \
     get_account
+from ..module_utils.pureport_info import \
+    get_filters_argument_spec, \
+    get_listing_argument_spec, \
+    iter_listing, \
+    format_items
 
 
 def find_ports(module):
@@ -177,15 +183,19 @@ def find_ports(module):
     client = get_client(module)
     account = get_account(module)
     try:
-        ports = client.accounts.ports(account).list()
-        module.exit_json(ports=[camel_dict_to_snake_dict(port) for port in ports])
+        ports = iter_listing(client, '%s/ports' % account['href'])
+        module.exit_json(ports=format_items(module, ports))
     except ClientHttpException as e:
         module.fail_json(msg=e.response.text, exception=format_exc())
+    except ValueError as e:
+        module.fail_json(msg=str(e), exception=format_exc())
 
 
 def main():
     argument_spec = dict()
     argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_listing_argument_spec())
+    argument_spec.update(get_filters_argument_spec())
     argument_spec.update(get_account_argument_spec())
     mutually_exclusive = []
     mutually_exclusive += get_client_mutually_exclusive()
@@ -68,6 +68,59 @@ options:
   virtual_interface_id:
     description:
       - The virtual interface ID.
+  virtual_interfaces:
+    description:
+      - Reconcile many virtual interfaces in one task, such as those of a primary and secondary connection.
+      - Each item accepts the state, id_to_associate (or its aliases), public, name, vlan, bgp_asn, authentication_key,
+        amazon_address, customer_address, address_type, cidr, virtual_gateway_id, virtual_interface_id and
+        direct_connect_gateway_id options, which default to the value of the option for the module.
+      - The virtual interfaces are found with a single description of the region, then created, associated or
+        deleted concurrently.
+      - No two items may have the same virtual_interface_id, or the same name and id_to_associate, or find the same
+        existing virtual interface.
+    type: list
+    elements: dict
+  confirm_connections:
+    description:
+      - Confirm the hosted connections to associate which are still ordering, before reconciling the virtual interfaces.
+    type: bool
+    default: false
+  parallelism:
+    description:
+      - The maximum number of virtual interfaces reconciled or connections confirmed concurrently.
+    type: int
+    default: 5
+  rate_limit:
+    description:
+      - The maximum number of DirectConnect API calls per second, shared by all of the concurrent calls and their retries.
+      - Must be greater than 0.
+    type: float
+    default: 5.0
+  retry_budget:
+    description:
+      - The number of seconds a DirectConnect API call may take, including its retries, or 0 to not retry.
+      - Throttled calls are always retried, and failed describe calls are also retried, waiting a random, growing
+        delay between attempts or the Retry-After of the response. The number of retries is returned as
+        pureport_retries.
+    type: int
+    default: 120
+  cache_ttl:
+    description:
+      - The virtual interfaces of the region are described once per task. With a cache_ttl, the description is kept
+        in memory for this number of seconds and shared by later tasks with the same region and AWS account which run
+        in the same process, such as with the pureport.pureport.run_module action. The cached description is updated
+        with the results of creating, associating or deleting a virtual interface. Use 0 to not cache it.
+      - A cached description is always refreshed before deciding to create, associate or delete a virtual interface,
+        but a task which does not change a virtual interface may return results which are up to cache_ttl seconds
+        stale, such as a virtual interface which was since deleted outside of Ansible.
+      - The AWS account is found with an STS GetCallerIdentity call. If it can not be found, nothing is cached.
+    type: int
+    default: 0
+  force_refresh:
+    description:
+      - Describe the virtual interfaces, even if they are cached.
+    type: bool
+    default: false
 extends_documentation_fragment:
   - aws
   - ec2
@@ -210,6 +263,22 @@ vlan:
   returned: always
   type: int
   sample: 100
+virtual_interfaces:
+  description:
+    - A result per item of I(virtual_interfaces), with the same keys as a single virtual interface, if it changed
+      and a msg if it failed.
+  returned: when I(virtual_interfaces) is set
+  type: list
+pureport_retries:
+  description: The number of DirectConnect API calls which were retried.
+  returned: always
+  type: int
+  sample: 0
+confirmed_connections:
+  description: The IDs of the hosted connections which were confirmed.
+  returned: always
+  type: list
+  sample: [dxcon-fgb175av]
 '''
 
 EXAMPLES = '''
@@ -221,6 +290,20 @@ EXAMPLES = '''
     link_aggregation_group_id: LAG-XXXXXXXX
     connection_id: dxcon-XXXXXXXX
 
+- name: create the private virtual interfaces of a primary and secondary connection together
+  aws_direct_connect_virtual_interface:
+    state: present
+    public: false
+    direct_connect_gateway_id: fa407c39-6fb7-4e78-92d8-f95339a3186a
+    confirm_connections: true
+    virtual_interfaces:
+      - name: "{{ name }}-primary"
+        connection_id: dxcon-XXXXXXXX
+        vlan: 101
+      - name: "{{ name }}-secondary"
+        connection_id: dxcon-YYYYYYYY
+        vlan: 102
+
 - name: remove an association between a connection and virtual interface
   aws_direct_connect_virtual_interface:
     state: absent
@@ -230,9 +313,13 @@ EXAMPLES = '''
 '''
 
 import traceback
+from functools import partial, wraps
+from multiprocessing.pool import ThreadPool
+from threading import Lock
+from time import sleep, time
 from ansible.module_utils.aws.core import AnsibleAWSModule
-from ansible.module_utils.aws.direct_connect import DirectConnectError, delete_virtual_interface
-from ansible.module_utils.ec2 import (AWSRetry, boto3_conn,
+from ansible.module_utils.aws.direct_connect import DirectConnectError
+from ansible.module_utils.ec2 import (boto3_conn,
                                       ec2_argument_spec, get_aws_connection_info,
                                       camel_dict_to_snake_dict)
 
@@ -242,15 +329,61 @@ except ImportError:
     # handled by HAS_BOTO3
     pass
 
+from ..module_utils.pureport_retry import \
+    RETRY_BUDGET, \
+    RetryPolicy, \
+    install_retry_counts, \
+    parse_retry_after
+
+# Virtual interfaces in these states no longer match by name or connection ID
+DELETED_STATES = ('deleting', 'deleted')
+# The default number of DirectConnect API calls per second, below its throttling limits
+RATE_LIMIT = 5.0
+# The options of a virtual interface, which may be set per item of virtual_interfaces
+VI_PARAMS = ('state', 'id_to_associate', 'public', 'name', 'vlan', 'bgp_asn', 'authentication_key', 'amazon_address',
+             'customer_address', 'address_type', 'cidr', 'virtual_gateway_id', 'virtual_interface_id',
+             'direct_connect_gateway_id')
+
+# The indexes of the virtual interfaces by region, endpoint and AWS account, reused within the process until they expire
+_INDEXES = dict()
+# The error codes of throttled calls, which are always retried
+THROTTLING_ERROR_CODES = ('Throttling', 'ThrottlingException', 'ThrottledException', 'RequestThrottledException',
+                          'TooManyRequestsException', 'RequestLimitExceeded')
+# The error codes of failed calls, which are retried if the call is idempotent
+SERVER_ERROR_CODES = ('DirectConnectServerException', 'InternalFailure', 'ServiceUnavailable')
+# The retry policy of all boto3 calls
+RETRY_POLICY = RetryPolicy()
+
+
+def get_retry(idempotent, result, exception):
+    '''
+        Determine if a boto3 call should be retried. Throttled calls are always retried, and failed calls only if
+        they are idempotent. DirectConnect reports some throttling as a DirectConnectClientException.
+    '''
+    response = getattr(exception, 'response', None)
+    if not isinstance(response, dict):
+        return False, None
+    error = response.get('Error', {})
+    code = error.get('Code')
+    retry = code in THROTTLING_ERROR_CODES or \
+        (code == 'DirectConnectClientException' and 'rate exceeded' in error.get('Message', '').lower()) or \
+        (idempotent and code in SERVER_ERROR_CODES)
+    if not retry:
+        return False, None
+    headers = response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+    return True, parse_retry_after(headers.get('retry-after'))
+
 
 def try_except_ClientError(failure_msg):
     '''
-        Wrapper for boto3 calls that uses AWSRetry and handles exceptions
+        Wrapper for boto3 calls that uses the RETRY_POLICY and handles exceptions
     '''
     def wrapper(f):
+        idempotent = getattr(f, '__name__', '').startswith('describe_')
+
         def run_func(*args, **kwargs):
             try:
-                result = AWSRetry.backoff(tries=8, delay=5, catch_extra_error_codes=['DirectConnectClientException'])(f)(*args, **kwargs)
+                result, retries = RETRY_POLICY.call(lambda: f(*args, **kwargs), partial(get_retry, idempotent))
             except (ClientError, BotoCoreError) as e:
                 raise DirectConnectError(failure_msg, traceback.format_exc(), e)
             return result
@@ -258,25 +391,184 @@ def try_except_ClientError(failure_msg):
     return wrapper
 
 
-def find_unique_vi(client, connection_id, virtual_interface_id, name):
+class VirtualInterfaceGroups(object):
+    '''
+        The virtual interfaces which are not being deleted, grouped by name, connection ID and both in a single
+        pass, so they can be filtered without scanning them again.
+    '''
+
+    def __init__(self, virtual_interfaces=()):
+        self.all = []
+        self.by_name = {}
+        self.by_connection_id = {}
+        self.by_name_and_connection_id = {}
+        for vi in virtual_interfaces:
+            self.add(vi)
+
+    def _groups(self, vi):
+        return (self.all,
+                self.by_name.setdefault(vi['virtualInterfaceName'], []),
+                self.by_connection_id.setdefault(vi['connectionId'], []),
+                self.by_name_and_connection_id.setdefault((vi['virtualInterfaceName'], vi['connectionId']), []))
+
+    def add(self, vi):
+        if vi['virtualInterfaceState'] not in DELETED_STATES:
+            for group in self._groups(vi):
+                group.append(vi)
+
+    def discard(self, vi):
+        if vi['virtualInterfaceState'] not in DELETED_STATES:
+            for group in self._groups(vi):
+                group[:] = [other for other in group if other is not vi]
+
+
+class VirtualInterfaceIndex(object):
+    '''
+        The virtual interfaces of a region, described with a single call and indexed by their ID, name and
+        connection ID. Mutations update the index with their results rather than describing again.
+    '''
+
+    def __init__(self, client, cache_ttl=0):
+        self.client = client
+        self.cache_ttl = cache_ttl
+        self.lock = Lock()
+        self.refresh()
+
+    def _index(self, virtual_interfaces):
+        self.by_id = dict((vi['virtualInterfaceId'], vi) for vi in virtual_interfaces)
+        self.groups = VirtualInterfaceGroups(virtual_interfaces)
+
+    def refresh(self):
+        '''
+            Describe all of the virtual interfaces of the region
+        '''
+        virtual_interfaces = try_except_ClientError(
+            failure_msg="Failed to describe virtual interfaces")(
+            self.client.describe_virtual_interfaces)().get('virtualInterfaces')
+        self.cached = False
+        self.expires_at = time() + self.cache_ttl
+        self._index(virtual_interfaces)
+
+    def get(self, virtual_interface_id):
+        '''
+            Returns the virtual interface with the ID, or None if it does not exist
+        '''
+        return self.by_id.get(virtual_interface_id)
+
+    def update(self, virtual_interface):
+        '''
+            Add or replace a virtual interface returned by a mutation
+        '''
+        with self.lock:
+            previous = self.by_id.get(virtual_interface['virtualInterfaceId'])
+            if previous is not None:
+                self.groups.discard(previous)
+            self.by_id[virtual_interface['virtualInterfaceId']] = virtual_interface
+            self.groups.add(virtual_interface)
+
+    def remove(self, virtual_interface_id):
+        '''
+            Mark a virtual interface as deleting after it was deleted
+        '''
+        if virtual_interface_id in self.by_id:
+            self.update(dict(self.by_id[virtual_interface_id], virtualInterfaceState='deleting'))
+
+
+def get_caller_account(module, region, aws_connect_kwargs):
+    '''
+        Returns the AWS account ID of the credentials, which may come from the environment or an instance role,
+        or None if it could not be found
+    '''
+    try:
+        sts = boto3_conn(module, conn_type='client', resource='sts', region=region, **aws_connect_kwargs)
+        return sts.get_caller_identity()['Account']
+    except (ClientError, BotoCoreError, KeyError):
+        return None
+
+
+def get_virtual_interface_index(module, client, region, ec2_url, aws_connect_kwargs, cache_ttl, force_refresh):
+    '''
+        Returns the index of the region's virtual interfaces. With a cache_ttl, the index is reused by later modules
+        of the process with the same region, endpoint and AWS account, such as when modules are run in-process,
+        until it expires.
+    '''
+    if cache_ttl <= 0:
+        return VirtualInterfaceIndex(client)
+    account = get_caller_account(module, region, aws_connect_kwargs)
+    if account is None:
+        return VirtualInterfaceIndex(client)
+    cache_key = (region, ec2_url, account)
+    index = _INDEXES.get(cache_key)
+    if index is not None and not force_refresh and index.expires_at > time():
+        index.client = client
+        index.cache_ttl = cache_ttl
+        index.cached = True
+        return index
+    index = VirtualInterfaceIndex(client, cache_ttl=cache_ttl)
+    _INDEXES[cache_key] = index
+    return index
+
+
+class TokenBucket(object):
+    '''
+        Limits calls to rate per second on average, allowing bursts of up to a second's worth of calls.
+        Callers block until a token is available, so it can be shared by many threads.
+    '''
+
+    def __init__(self, rate):
+        self.rate = float(rate)
+        self.capacity = max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time()
+        self.lock = Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            sleep(delay)
+
+
+class RateLimitedClient(object):
+    '''
+        Wraps a boto3 client, acquiring a token from the bucket before each of its API calls, including retries
+    '''
+
+    def __init__(self, client, bucket):
+        self.client = client
+        self.bucket = bucket
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def call(*args, **kwargs):
+            self.bucket.acquire()
+            return attr(*args, **kwargs)
+        return call
+
+
+def find_unique_vi(index, connection_id, virtual_interface_id, name):
     '''
         Determines if the virtual interface exists. Returns the virtual interface ID if an exact match is found.
         If multiple matches are found False is returned. If no matches are found None is returned.
     '''
 
-    # Get the virtual interfaces, filtering by the ID if provided.
-    vi_params = {}
+    # Get the virtual interfaces from the index, filtering by the ID if provided.
+    groups = index.groups
     if virtual_interface_id:
-        vi_params = {'virtualInterfaceId': virtual_interface_id}
-
-    virtual_interfaces = try_except_ClientError(
-        failure_msg="Failed to describe virtual interface")(
-        client.describe_virtual_interfaces)(**vi_params).get('virtualInterfaces')
-
-    # Remove deleting/deleted matches from the results.
-    virtual_interfaces = [vi for vi in virtual_interfaces if vi['virtualInterfaceState'] not in ('deleting', 'deleted')]
+        vi = index.get(virtual_interface_id)
+        groups = VirtualInterfaceGroups([vi] if vi is not None else [])
 
-    matching_virtual_interfaces = filter_virtual_interfaces(virtual_interfaces, name, connection_id)
+    matching_virtual_interfaces = filter_virtual_interfaces(groups, name, connection_id)
     return exact_match(matching_virtual_interfaces)
 
 
@@ -295,50 +587,49 @@ def exact_match(virtual_interfaces):
         return False
 
 
-def filter_virtual_interfaces(virtual_interfaces, name, connection_id):
+def filter_virtual_interfaces(groups, name, connection_id):
     '''
-        Filters the available virtual interfaces to try to find a unique match
+        Filters the grouped virtual interfaces to try to find a unique match
     '''
     # Filter by name if provided.
     if name:
-        matching_by_name = find_virtual_interface_by_name(virtual_interfaces, name)
+        matching_by_name = find_virtual_interface_by_name(groups, name)
         if len(matching_by_name) == 1:
             return matching_by_name
     else:
-        matching_by_name = virtual_interfaces
+        matching_by_name = groups.all
 
     # If there isn't a unique match filter by connection ID as last resort (because connection_id may be a connection yet to be associated)
     if connection_id and len(matching_by_name) > 1:
-        matching_by_connection_id = find_virtual_interface_by_connection_id(matching_by_name, connection_id)
-        if len(matching_by_connection_id) == 1:
-            return matching_by_connection_id
-    else:
-        matching_by_connection_id = matching_by_name
+        if name:
+            return groups.by_name_and_connection_id.get((name, connection_id), [])
+        return find_virtual_interface_by_connection_id(groups, connection_id)
 
-    return matching_by_connection_id
+    return matching_by_name
 
 
-def find_virtual_interface_by_connection_id(virtual_interfaces, connection_id):
+def find_virtual_interface_by_connection_id(groups, connection_id):
     '''
         Return virtual interfaces that have the connection_id associated
     '''
-    return [vi for vi in virtual_interfaces if vi['connectionId'] == connection_id]
+    return groups.by_connection_id.get(connection_id, [])
 
 
-def find_virtual_interface_by_name(virtual_interfaces, name):
+def find_virtual_interface_by_name(groups, name):
     '''
         Return virtual interfaces that match the provided name
     '''
-    return [vi for vi in virtual_interfaces if vi['virtualInterfaceName'] == name]
+    return groups.by_name.get(name, [])
 
 
-def vi_state(client, virtual_interface_id):
+def vi_state(index, virtual_interface_id):
     '''
         Returns the state of the virtual interface.
     '''
-    err_msg = "Failed to describe virtual interface: {0}".format(virtual_interface_id)
-    vi = try_except_ClientError(failure_msg=err_msg)(client.describe_virtual_interfaces)(virtualInterfaceId=virtual_interface_id)
-    return vi['virtualInterfaces'][0]
+    vi = index.get(virtual_interface_id)
+    if vi is None:
+        raise DirectConnectError("Failed to describe virtual interface: {0}".format(virtual_interface_id), None, None)
+    return vi
 
 
 def assemble_params_for_creating_vi(params):
@@ -388,7 +679,7 @@ def create_vi(client, public, associated_id, creation_params):
         :param associated_id: a link aggregation group ID or connection ID to associate
                               with the virtual interface.
         :param creation_params: a dict of parameters to use in the boto call
-        :return The ID of the created virtual interface
+        :return The created virtual interface
     '''
     err_msg = "Failed to create virtual interface"
     if public:
@@ -402,58 +693,95 @@ def create_vi(client, public, associated_id, creation_params):
         )(
             connectionId=associated_id,
             newPrivateVirtualInterface=creation_params)
-    return vi['virtualInterfaceId']
+    return vi
+
+
+def delete_vi(client, virtual_interface_id):
+    '''
+        Delete the virtual interface
+    '''
+    err_msg = "Failed to delete virtual interface {0}".format(virtual_interface_id)
+    try_except_ClientError(failure_msg=err_msg)(client.delete_virtual_interface)(virtualInterfaceId=virtual_interface_id)
 
 
 def modify_vi(client, virtual_interface_id, connection_id):
     '''
         Associate a new connection ID
+        :return The associated virtual interface
     '''
     err_msg = "Unable to associate {0} with virtual interface {1}".format(connection_id, virtual_interface_id)
-    try_except_ClientError(failure_msg=err_msg)(client.associate_virtual_interface)(virtualInterfaceId=virtual_interface_id,
-                                                                                    connectionId=connection_id)
+    return try_except_ClientError(failure_msg=err_msg)(client.associate_virtual_interface)(virtualInterfaceId=virtual_interface_id,
+                                                                                           connectionId=connection_id)
 
 
-def needs_modification(client, virtual_interface_id, connection_id):
+def needs_modification(index, virtual_interface_id, connection_id):
     '''
         Determine if the associated connection ID needs to be updated
     '''
-    return vi_state(client, virtual_interface_id).get('connectionId') != connection_id
+    return vi_state(index, virtual_interface_id).get('connectionId') != connection_id
 
 
-def ensure_state(connection, module):
-    changed = False
+def needs_change(index, state, virtual_interface_id, connection_id):
+    '''
+        Determine if the virtual interface needs to be created, associated or deleted
+    '''
+    if state == 'present':
+        return not virtual_interface_id or needs_modification(index, virtual_interface_id, connection_id)
+    return bool(virtual_interface_id)
+
 
-    state = module.params['state']
-    connection_id = module.params['id_to_associate']
-    public = module.params['public']
-    name = module.params['name']
+def find_vi(index, params):
+    '''
+        Find the virtual interface of the params, see find_unique_vi
+    '''
+    return find_unique_vi(index, params['id_to_associate'], params.get('virtual_interface_id'), params['name'])
+
+
+def needs_refresh(index, params, virtual_interface_id):
+    '''
+        Never fail or mutate based on a cached description, which may have changed since
+    '''
+    if not index.cached:
+        return False
+    return virtual_interface_id is False or needs_change(index, params['state'], virtual_interface_id, params['id_to_associate'])
 
-    virtual_interface_id = find_unique_vi(connection, connection_id, module.params.get('virtual_interface_id'), name)
+
+def apply_state(connection, index, params, virtual_interface_id):
+    '''
+        Create, associate or delete the found virtual interface to match the params
+    '''
+    changed = False
+
+    state = params['state']
+    connection_id = params['id_to_associate']
+    public = params['public']
 
     if virtual_interface_id is False:
-        module.fail_json(msg="Multiple virtual interfaces were found. Use the virtual_interface_id, name, "
-                             "and connection_id options if applicable to find a unique match.")
+        raise DirectConnectError("Multiple virtual interfaces were found. Use the virtual_interface_id, name, "
+                                 "and connection_id options if applicable to find a unique match.")
 
     if state == 'present':
 
-        if not virtual_interface_id and module.params['virtual_interface_id']:
-            module.fail_json(msg="The virtual interface {0} does not exist.".format(module.params['virtual_interface_id']))
+        if not virtual_interface_id and params['virtual_interface_id']:
+            raise DirectConnectError("The virtual interface {0} does not exist.".format(params['virtual_interface_id']))
 
         elif not virtual_interface_id:
-            assembled_params = assemble_params_for_creating_vi(module.params)
-            virtual_interface_id = create_vi(connection, public, connection_id, assembled_params)
+            assembled_params = assemble_params_for_creating_vi(params)
+            vi = create_vi(connection, public, connection_id, assembled_params)
+            index.update(vi)
+            virtual_interface_id = vi['virtualInterfaceId']
             changed = True
 
-        if needs_modification(connection, virtual_interface_id, connection_id):
-            modify_vi(connection, virtual_interface_id, connection_id)
+        if needs_modification(index, virtual_interface_id, connection_id):
+            index.update(modify_vi(connection, virtual_interface_id, connection_id))
             changed = True
 
-        latest_state = vi_state(connection, virtual_interface_id)
+        latest_state = vi_state(index, virtual_interface_id)
 
     else:
         if virtual_interface_id:
-            delete_virtual_interface(connection, virtual_interface_id)
+            delete_vi(connection, virtual_interface_id)
+            index.remove(virtual_interface_id)
             changed = True
 
         latest_state = {}
@@ -461,15 +789,129 @@ def ensure_state(connection, module):
     return changed, latest_state
 
 
+def ensure_state(connection, index, params):
+    virtual_interface_id = find_vi(index, params)
+    if needs_refresh(index, params, virtual_interface_id):
+        index.refresh()
+        virtual_interface_id = find_vi(index, params)
+    return apply_state(connection, index, params, virtual_interface_id)
+
+
+def ensure_states(connection, index, vi_params, parallelism):
+    '''
+        Reconcile many virtual interfaces concurrently. The virtual interfaces are all found in the index first,
+        refreshing it at most once, then each one is created, associated or deleted by a bounded pool of workers.
+        Items which found the same virtual interface are rejected before any of them are applied.
+        :return a result per virtual interface, with its latest state, if it changed and a msg if it failed
+    '''
+    virtual_interface_ids = [find_vi(index, params) for params in vi_params]
+    if any(needs_refresh(index, params, virtual_interface_id)
+           for params, virtual_interface_id in zip(vi_params, virtual_interface_ids)):
+        index.refresh()
+        virtual_interface_ids = [find_vi(index, params) for params in vi_params]
+
+    found = [virtual_interface_id for virtual_interface_id in virtual_interface_ids if virtual_interface_id]
+    duplicates = sorted(set(virtual_interface_id for virtual_interface_id in found if found.count(virtual_interface_id) > 1))
+    if duplicates:
+        raise DirectConnectError("More than one item of virtual_interfaces found the same virtual interface: {0}. Use "
+                                 "the virtual_interface_id, name, and connection_id options to find a unique match "
+                                 "for each item.".format(', '.join(duplicates)))
+
+    def apply(args):
+        params, virtual_interface_id = args
+        try:
+            changed, latest_state = apply_state(connection, index, params, virtual_interface_id)
+        except DirectConnectError as e:
+            return dict(changed=False, msg=e.msg if not e.exception else "{0}: {1}".format(e.msg, e.exception))
+        return dict(camel_dict_to_snake_dict(latest_state), changed=changed)
+
+    pool = ThreadPool(max(1, min(parallelism, len(vi_params))))
+    try:
+        return pool.map(apply, list(zip(vi_params, virtual_interface_ids)))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def confirm_connections(connection, connection_ids, parallelism):
+    '''
+        Confirm the hosted connections which are still ordering, describing all of the connections once
+        :return the IDs of the confirmed connections
+    '''
+    connections = try_except_ClientError(
+        failure_msg="Failed to describe connections")(
+        connection.describe_connections)().get('connections')
+    ordering = [c['connectionId'] for c in connections
+                if c['connectionId'] in connection_ids and c['connectionState'] == 'ordering']
+
+    def confirm(connection_id):
+        err_msg = "Failed to confirm connection {0}".format(connection_id)
+        try_except_ClientError(failure_msg=err_msg)(connection.confirm_connection)(connectionId=connection_id)
+
+    pool = ThreadPool(max(1, min(parallelism, len(ordering))))
+    try:
+        pool.map(confirm, ordering)
+    finally:
+        pool.close()
+        pool.join()
+    return ordering
+
+
+def merge_vi_params(params, vi):
+    '''
+        Returns the params of a virtual interface in the virtual_interfaces list, defaulting to the module params
+    '''
+    return dict((k, vi.get(k) if vi.get(k) is not None else params[k]) for k in VI_PARAMS)
+
+
+def check_vi_params(params):
+    '''
+        Returns why the params of a virtual interface are invalid, or None if they are valid
+    '''
+    missing = [k for k in ('state', 'id_to_associate') if not params[k]]
+    if missing:
+        return "missing required arguments: {0}".format(', '.join(missing))
+    if not params['virtual_interface_id'] and not params['name']:
+        return "one of the following is required: virtual_interface_id, name"
+    if params['virtual_gateway_id'] and params['direct_connect_gateway_id']:
+        return "parameters are mutually exclusive: virtual_gateway_id|direct_connect_gateway_id"
+    if params['state'] == 'present' and params['public'] is None:
+        return "state is present but all of the following are missing: public"
+    if params['public']:
+        missing = [k for k in ('amazon_address', 'customer_address', 'cidr') if not params[k]]
+        if missing:
+            return "public is True but all of the following are missing: {0}".format(', '.join(missing))
+    return None
+
+
+def check_duplicate_vi_params(vi_params):
+    '''
+        Returns why the virtual interfaces are ambiguous, if two of them have the same name and connection ID or the same
+        virtual interface ID, as they would be reconciled concurrently, or None if they are unique
+    '''
+    seen = set()
+    for params in vi_params:
+        keys = []
+        if params['virtual_interface_id']:
+            keys.append(('virtual_interface_id', params['virtual_interface_id']))
+        if params['name']:
+            keys.append(('name and id_to_associate', (params['name'], params['id_to_associate'])))
+        for key in keys:
+            if key in seen:
+                return "virtual_interfaces has more than one item with the same {0}: {1}".format(
+                    key[0], ', '.join(key[1]) if isinstance(key[1], tuple) else key[1])
+            seen.add(key)
+    return None
+
+
 def main():
-    argument_spec = ec2_argument_spec()
-    argument_spec.update(dict(
-        state=dict(required=True, choices=['present', 'absent']),
-        id_to_associate=dict(required=True, aliases=['link_aggregation_group_id', 'connection_id']),
+    vi_spec = dict(
+        state=dict(choices=['present', 'absent']),
+        id_to_associate=dict(aliases=['link_aggregation_group_id', 'connection_id']),
         public=dict(type='bool'),
         name=dict(),
-        vlan=dict(type='int', default=100),
-        bgp_asn=dict(type='int', default=65000),
+        vlan=dict(type='int'),
+        bgp_asn=dict(type='int'),
         authentication_key=dict(),
         amazon_address=dict(),
         customer_address=dict(),
@@ -478,28 +920,78 @@ def main():
         virtual_gateway_id=dict(),
         virtual_interface_id=dict(),
         direct_connect_gateway_id=dict(),
+    )
+    argument_spec = ec2_argument_spec()
+    argument_spec.update(vi_spec)
+    argument_spec.update(dict(
+        vlan=dict(type='int', default=100),
+        bgp_asn=dict(type='int', default=65000),
+        virtual_interfaces=dict(type='list', elements='dict', options=vi_spec),
+        confirm_connections=dict(type='bool', default=False),
+        parallelism=dict(type='int', default=5),
+        rate_limit=dict(type='float', default=RATE_LIMIT),
+        cache_ttl=dict(type='int', default=0),
+        force_refresh=dict(type='bool', default=False),
+        retry_budget=dict(type='int', default=RETRY_BUDGET),
     ))
 
     module = AnsibleAWSModule(argument_spec=argument_spec,
-                              required_one_of=[['virtual_interface_id', 'name']],
-                              required_if=[['state', 'present', ['public']],
-                                           ['public', True, ['amazon_address']],
-                                           ['public', True, ['customer_address']],
-                                           ['public', True, ['cidr']]],
                               mutually_exclusive=[['virtual_gateway_id', 'direct_connect_gateway_id']])
+    if module.params['rate_limit'] <= 0:
+        module.fail_json(msg="rate_limit must be greater than 0")
+    RETRY_POLICY.budget = module.params['retry_budget']
+    install_retry_counts(module, RETRY_POLICY)
+
+    virtual_interfaces = module.params['virtual_interfaces']
+    if virtual_interfaces is None:
+        vi_params = [module.params]
+    else:
+        vi_params = [merge_vi_params(module.params, vi) for vi in virtual_interfaces]
+    for params in vi_params:
+        error = check_vi_params(params)
+        if error is not None:
+            module.fail_json(msg=error)
+    error = check_duplicate_vi_params(vi_params)
+    if error is not None:
+        module.fail_json(msg=error)
 
     region, ec2_url, aws_connect_kwargs = get_aws_connection_info(module, boto3=True)
     connection = boto3_conn(module, conn_type='client', resource='directconnect', region=region, endpoint=ec2_url, **aws_connect_kwargs)
+    connection = RateLimitedClient(connection, TokenBucket(module.params['rate_limit']))
+    parallelism = module.params['parallelism']
 
+    confirmed_connections = []
     try:
-        changed, latest_state = ensure_state(connection, module)
+        if module.params['confirm_connections']:
+            confirmed_connections = confirm_connections(connection,
+                                                        set(params['id_to_associate'] for params in vi_params),
+                                                        parallelism)
+        index = get_virtual_interface_index(module, connection, region, ec2_url, aws_connect_kwargs,
+                                            module.params['cache_ttl'], module.params['force_refresh'])
+        if virtual_interfaces is None:
+            changed, latest_state = ensure_state(connection, index, module.params)
+        else:
+            results = ensure_states(connection, index, vi_params, parallelism)
     except DirectConnectError as e:
         if e.exception:
             module.fail_json_aws(exception=e.exception, msg=e.msg)
         else:
             module.fail_json(msg=e.msg)
 
-    module.exit_json(changed=changed, **camel_dict_to_snake_dict(latest_state))
+    if virtual_interfaces is None:
+        module.exit_json(changed=changed or len(confirmed_connections) > 0,
+                         confirmed_connections=confirmed_connections,
+                         **camel_dict_to_snake_dict(latest_state))
+
+    changed = len(confirmed_connections) > 0 or any(result['changed'] for result in results)
+    failed = [result for result in results if 'msg' in result]
+    if failed:
+        module.fail_json(msg="Failed to reconcile {0} of {1} virtual interfaces: {2}".format(
+                             len(failed), len(results), ' '.join(result['msg'] for result in failed)),
+                         changed=changed,
+                         confirmed_connections=confirmed_connections,
+                         virtual_interfaces=results)
+    module.exit_json(changed=changed, confirmed_connections=confirmed_connections, virtual_interfaces=results)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,56 @@
+#!/usr/bin/python
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'Pureport'
+}
+
+DOCUMENTATION = '''
+---
+module: run_module
+short_description: Run a Pureport module in-process on the controller
+description:
+    - "Run one of this collection's Pureport modules in-process on the controller, rather than shipping it to
+      the host and starting a new Python process for each task.  The Pureport modules only talk to the Pureport
+      API, so for tasks looping over many items, interpreter startup and imports otherwise dominate."
+    - "Within a task, a logged in client, its pooled connections and the listings used to resolve existing
+      objects are shared by every iteration of a loop with the same client params.  Clients recording
+      'api_metrics' are not shared."
+    - "This module is implemented by an action plugin, and always runs on the controller, regardless of the
+      host of the task."
+version_added: "2.9"
+requirements: [ pureport-client ]
+author: Matt Traynham (@mtraynham)
+options:
+    module:
+        description:
+            - The name of the Pureport module to run (e.g network or site_ipsec_vpn_connection).
+        required: true
+        type: str
+    args:
+        description:
+            - The arguments of the module.
+        required: false
+        type: dict
+        default: {}
+'''
+
+EXAMPLES = '''
+- name: Create many networks without starting a module process per network
+  run_module:
+    module: network
+    args:
+      api_key: XXXXXXXXXXXXX
+      api_secret: XXXXXXXXXXXXXXXXX
+      account_href: /accounts/ac-XXXXXXXXXXXXXXXXXXXXXX
+      name: "{{ item }}"
+  loop:
+    - My Network 1
+    - My Network 2
+    - My Network 3
+'''
+
+RETURN = '''
+# The result of the module which was run
+'''
@@ -21,6 +21,8 @@ options:
 extends_documentation_fragment:
     - pureport.pureport.client
     - pureport.pureport.account
+    - pureport.pureport.filters
+    - pureport.pureport.listing
 '''
 
 EXAMPLES = '''
@@ -190,7 +192,6 @@ supported_connections:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
 from traceback import format_exc
 
 try:
@@ -203,6 +204,11 @@ from ..module_utils.pureport import \
     get_client, \
     get_account_argument_spec, \
     get_account
+from ..module_utils.pureport_info import \
+    get_filters_argument_spec, \
+    get_listing_argument_spec, \
+    iter_listing, \
+    format_items
 
 
 def find_supported_connections(module):
@@ -213,16 +219,19 @@ def find_supported_connections(module):
     client = get_client(module)
     account = get_account(module)
     try:
-        supported_connections = client.accounts.supported_connections(account).list()
-        module.exit_json(supported_connections=[camel_dict_to_snake_dict(supported_connection)
-                                                for supported_connection in supported_connections])
+        supported_connections = iter_listing(client, '%s/supportedConnections' % account['href'])
+        module.exit_json(supported_connections=format_items(module, supported_connections))
     except ClientHttpException as e:
         module.fail_json(msg=e.response.text, exception=format_exc())
+    except ValueError as e:
+        module.fail_json(msg=str(e), exception=format_exc())
 
 
 def main():
     argument_spec = dict()
     argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_listing_argument_spec())
+    argument_spec.update(get_filters_argument_spec())
     argument_spec.update(get_account_argument_spec(True))
     mutually_exclusive = []
     mutually_exclusive += get_client_mutually_exclusive()
@@ -0,0 +1,93 @@
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import pytest
+
+# Import the collection the same way Ansible does, through the test playbooks' collections path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'playbooks', 'collections'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from ansible.module_utils import basic
+from ansible.module_utils.common.text.converters import to_bytes
+from fake_pureport_api import FakePureportApi
+
+# The connection volumes benchmarked by default, which can be overridden with --pureport-volumes
+DEFAULT_VOLUMES = '10,1000'
+
+
+def pytest_addoption(parser):
+    parser.addoption('--pureport-volumes',
+                     default=os.environ.get('PUREPORT_BENCHMARK_VOLUMES', DEFAULT_VOLUMES),
+                     help='A comma separated list of connection volumes to benchmark (e.g 10,1000,100000)')
+
+
+def pytest_generate_tests(metafunc):
+    if 'volume' in metafunc.fixturenames:
+        volumes = [int(volume) for volume in metafunc.config.getoption('pureport_volumes').split(',')]
+        metafunc.parametrize('volume', volumes)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def pureport_cache_dir():
+    """
+    Keep the token and catalog caches out of the user's cache directory
+    """
+    cache_dir = tempfile.mkdtemp()
+    os.environ['PUREPORT_CACHE_DIR'] = cache_dir
+    yield cache_dir
+
+
+@pytest.fixture(scope='session')
+def fake_api():
+    """
+    A fake Pureport API, served in-process for the whole session
+    :rtype: FakePureportApi
+    """
+    api = FakePureportApi()
+    api.start()
+    yield api
+    api.stop()
+
+
+@pytest.fixture
+def make_module(fake_api):
+    """
+    A factory of Ansible modules, built from an argument spec and params the
+    same way Ansible builds them when running a module
+    :rtype: (dict, dict) -> ansible.module_utils.basic.AnsibleModule
+    """
+    def make(argument_spec, params):
+        args = dict(api_base_url=fake_api.base_url, api_access_token='token')
+        args.update(params)
+        basic._ANSIBLE_ARGS = to_bytes(json.dumps(dict(ANSIBLE_MODULE_ARGS=args)))
+        return basic.AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+    yield make
+    basic._ANSIBLE_ARGS = None
+
+
+@pytest.fixture
+def measure(benchmark, fake_api):
+    """
+    Benchmark an operation.  Before it is timed, the operation is run once to
+    record the number of requests it sends and its peak memory, which are
+    stored in the benchmark's extra info.
+    :rtype: (() -> T, () -> None, int) -> T
+    """
+    def run(operation_fn, setup_fn=None, rounds=5):
+        if setup_fn is not None:
+            setup_fn()
+        fake_api.reset_request_count()
+        tracemalloc.start()
+        try:
+            result = operation_fn()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info['requests'] = fake_api.request_count
+        benchmark.extra_info['peak_memory'] = peak_memory
+        benchmark.pedantic(operation_fn, setup=setup_fn, rounds=rounds)
+        return result
+    return run
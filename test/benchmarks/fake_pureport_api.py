@@ -0,0 +1,264 @@
+import json
+import re
+import threading
+from itertools import count
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+_CONNECTION_PATH = re.compile(r'^/connections/([\w-]+)$')
+_NETWORK_PATH = re.compile(r'^/networks/([\w-]+)$')
+_NETWORK_CONNECTIONS_PATH = re.compile(r'^/networks/([\w-]+)/connections$')
+_ACCOUNT_NETWORKS_PATH = re.compile(r'^/accounts/([\w-]+)/networks$')
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FakePureportApi(object):
+    def __init__(self):
+        """
+        An in-process fake of the parts of the Pureport API used by the
+        modules, holding accounts, networks and connections in memory.  Every
+        request is counted, so benchmarks can assert how many round trips an
+        operation takes.
+        """
+        self.__lock = threading.Lock()
+        self.__ids = count()
+        self.__networks = dict()
+        self.__connections = dict()
+        self.__encoded_listings = dict()
+        self.__revoked_access_tokens = set()
+        self.request_count = 0
+        self.__server = None
+
+    @property
+    def base_url(self):
+        """
+        The base url of the running server
+        :rtype: str
+        """
+        return 'http://127.0.0.1:%d' % self.__server.server_address[1]
+
+    def start(self):
+        """
+        Start serving on a random local port
+        """
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def __handle(self, method):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length).decode('utf-8')) if length > 0 else None
+                authorization = self.headers.get('Authorization') or ''
+                access_token = authorization[len('Bearer '):] if authorization.startswith('Bearer ') else None
+                status, data = api.handle(method, self.path, body, access_token)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self.__handle('GET')
+
+            def do_POST(self):
+                self.__handle('POST')
+
+            def do_PUT(self):
+                self.__handle('PUT')
+
+            def do_DELETE(self):
+                self.__handle('DELETE')
+
+        self.__server = _ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=self.__server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        """
+        Stop serving
+        """
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def reset_request_count(self):
+        """
+        Reset the request count
+        """
+        with self.__lock:
+            self.request_count = 0
+
+    def revoke_access_token(self, access_token):
+        """
+        Revoke an access token, such as the API does after a logout, so
+        requests sent with it are rejected as unauthorized
+        :param str access_token: the access token
+        """
+        with self.__lock:
+            self.__revoked_access_tokens.add(access_token)
+
+    def add_network(self, account_id, name):
+        """
+        Add a network to an account
+        :param str account_id: the account id
+        :param str name: the network name
+        :rtype: dict
+        """
+        with self.__lock:
+            network_id = 'network-%d' % next(self.__ids)
+            network = dict(
+                id=network_id,
+                href='/networks/%s' % network_id,
+                name=name,
+                account=dict(href='/accounts/%s' % account_id)
+            )
+            self.__networks[network_id] = network
+            self.__encoded_listings.clear()
+            return network
+
+    def seed_connections(self, network, volume):
+        """
+        Add a volume of Site IPSec VPN connections to a network
+        :param dict network: the network
+        :param int volume: the number of connections
+        :rtype: list[dict]
+        """
+        with self.__lock:
+            connections = []
+            for i in range(volume):
+                connection = self.__new_connection(network['id'], make_connection('Connection %d' % i, i))
+                self.__connections[connection['id']] = connection
+                connections.append(connection)
+            self.__encoded_listings.clear()
+            return connections
+
+    def __new_connection(self, network_id, connection):
+        connection_id = 'conn-%d' % next(self.__ids)
+        connection = dict(connection)
+        connection.update(dict(
+            id=connection_id,
+            href='/connections/%s' % connection_id,
+            network=dict(href='/networks/%s' % network_id),
+            state='ACTIVE'
+        ))
+        return connection
+
+    def __encode_listing(self, key, list_items_fn):
+        # Listings are encoded once until they change, so the fake's own work
+        # stays out of the client side memory and latency being measured
+        encoded = self.__encoded_listings.get(key)
+        if encoded is None:
+            encoded = json.dumps(list_items_fn()).encode('utf-8')
+            self.__encoded_listings[key] = encoded
+        return encoded
+
+    def handle(self, method, path, body, access_token=None):
+        """
+        Handle a request
+        :param str method: the HTTP method
+        :param str path: the request path
+        :param dict|None body: the decoded request body
+        :param str|None access_token: the request's access token
+        :returns: the status and the encoded response body
+        :rtype: (int, bytes)
+        """
+        path = path.split('?')[0]
+        with self.__lock:
+            self.request_count += 1
+            if method == 'POST' and path == '/login':
+                access_token = 'token-%d' % next(self.__ids)
+                return 200, encode(dict(access_token=access_token, refresh_token=access_token, expires_in=3600))
+            if access_token in self.__revoked_access_tokens:
+                return 401, encode(dict(message='Unauthorized'))
+
+            match = _ACCOUNT_NETWORKS_PATH.match(path)
+            if match is not None and method == 'GET':
+                account_href = '/accounts/%s' % match.group(1)
+                return 200, self.__encode_listing(path, lambda: [network for network in self.__networks.values()
+                                                                 if network['account']['href'] == account_href])
+
+            match = _NETWORK_PATH.match(path)
+            if match is not None and method == 'GET':
+                network = self.__networks.get(match.group(1))
+                return (200, encode(network)) if network is not None else (404, encode(dict(message='Not Found')))
+
+            match = _NETWORK_CONNECTIONS_PATH.match(path)
+            if match is not None:
+                network_href = '/networks/%s' % match.group(1)
+                if method == 'GET':
+                    return 200, self.__encode_listing(path, lambda: [connection for connection in self.__connections.values()
+                                                                     if connection['network']['href'] == network_href])
+                if method == 'POST':
+                    connection = self.__new_connection(match.group(1), body)
+                    self.__connections[connection['id']] = connection
+                    self.__encoded_listings.clear()
+                    return 201, encode(connection)
+
+            match = _CONNECTION_PATH.match(path)
+            if match is not None:
+                connection = self.__connections.get(match.group(1))
+                if connection is None:
+                    return 404, encode(dict(message='Not Found'))
+                if method == 'GET':
+                    return 200, encode(connection)
+                if method == 'PUT':
+                    connection = dict(body, state='ACTIVE')
+                    self.__connections[match.group(1)] = connection
+                    self.__encoded_listings.clear()
+                    return 200, encode(connection)
+                if method == 'DELETE':
+                    del self.__connections[match.group(1)]
+                    self.__encoded_listings.clear()
+                    return 200, encode(connection)
+            return 404, encode(dict(message='Not Found'))
+
+
+def encode(item):
+    """
+    Encode an item as a JSON response body
+    :param * item: the item
+    :rtype: bytes
+    """
+    return json.dumps(item).encode('utf-8')
+
+
+def make_connection(name, index=0):
+    """
+    Make a Site IPSec VPN connection as the API expects it
+    :param str name: the connection name
+    :param int index: a number used to vary the connection's properties
+    :rtype: dict
+    """
+    return dict(
+        name=name,
+        description='Benchmark connection %d' % index,
+        type='SITE_IPSEC_VPN',
+        speed=50,
+        highAvailability=True,
+        location=dict(href='/locations/us-sea'),
+        billingTerm='HOURLY',
+        customerASN=64512,
+        customerNetworks=[dict(name='Network %d' % n, address='10.%d.%d.0/24' % (index % 256, n))
+                          for n in range(4)],
+        nat=dict(enabled=True, mappings=[dict(nativeCidr='10.%d.%d.0/24' % (index % 256, n)) for n in range(4)]),
+        authType='PSK',
+        routingType='ROUTE_BASED_BGP',
+        primaryCustomerRouterIP='192.0.%d.%d' % (index // 256 % 256, index % 256),
+        ikeVersion='V2',
+        ikeV2=dict(
+            ike=dict(encryption='AES_256', prf='SHA_256', dhGroup='MODP_2048'),
+            esp=dict(encryption='AES_256_GCM_128', dhGroup='MODP_2048')
+        )
+    )
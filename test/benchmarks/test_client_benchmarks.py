@@ -0,0 +1,28 @@
+from itertools import count
+
+from ansible_collections.pureport.pureport.plugins.module_utils.pureport import \
+    create_client, \
+    get_client_session
+
+__KEYS = count()
+
+
+def test_create_client_with_revoked_cached_token(fake_api):
+    api_key = 'key-%d' % next(__KEYS)
+    network = fake_api.add_network('ac-client', 'Client Network')
+
+    # Logs in, caching the access token, which the API then revokes
+    client = create_client(fake_api.base_url, api_key=api_key, api_secret='secret')
+    fake_api.revoke_access_token(get_client_session(client)._access_token)
+
+    fake_api.reset_request_count()
+    client = create_client(fake_api.base_url, api_key=api_key, api_secret='secret')
+    assert client.networks.get_by_id(network['id'])['href'] == network['href']
+    # The rejected request, the login and the resent request
+    assert fake_api.request_count == 3
+
+    # The new access token was cached, so it is used without logging in
+    fake_api.reset_request_count()
+    client = create_client(fake_api.base_url, api_key=api_key, api_secret='secret')
+    assert client.networks.get_by_id(network['id'])['href'] == network['href']
+    assert fake_api.request_count == 1
@@ -0,0 +1,139 @@
+from copy import deepcopy
+from itertools import count
+
+import pytest
+
+from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
+from ansible_collections.pureport.pureport.plugins.module_utils.pureport import \
+    get_client_argument_spec, \
+    get_network_argument_spec
+from ansible_collections.pureport.pureport.plugins.module_utils.pureport_crud import \
+    get_state_argument_spec, \
+    get_resolve_existing_argument_spec, \
+    get_item_index, \
+    find_indexed_items, \
+    invalidate_item_indexes, \
+    deep_compare
+from ansible_collections.pureport.pureport.plugins.module_utils.pureport_connection_crud import \
+    get_wait_for_server_argument_spec, \
+    get_connections_argument_spec, \
+    connection_crud, \
+    connections_crud
+from ansible_collections.pureport.pureport.plugins.module_utils.pureport_info import \
+    get_filters_argument_spec, \
+    get_listing_argument_spec
+from ansible_collections.pureport.pureport.plugins.modules.connections_info import find_connections
+from fake_pureport_api import make_connection
+
+__NAMES = count()
+
+
+def get_connection_crud_argument_spec():
+    argument_spec = dict()
+    argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_network_argument_spec(True))
+    argument_spec.update(get_state_argument_spec())
+    argument_spec.update(get_resolve_existing_argument_spec())
+    argument_spec.update(get_wait_for_server_argument_spec())
+    return argument_spec
+
+
+@pytest.fixture
+def network(fake_api, volume):
+    """
+    A network seeded with a volume of connections
+    :rtype: dict
+    """
+    network = fake_api.add_network('ac-benchmark', 'Benchmark Network %d' % next(__NAMES))
+    fake_api.seed_connections(network, volume)
+    return network
+
+
+def test_deep_compare(measure, volume):
+    connections = [make_connection('Connection %d' % i, i) for i in range(volume)]
+    existing_connections = deepcopy(connections)
+    for i, existing_connection in enumerate(existing_connections):
+        existing_connection.update(dict(id='conn-%d' % i, href='/connections/conn-%d' % i, state='ACTIVE'))
+
+    assert measure(lambda: all(deep_compare(connection, existing_connection)
+                               for connection, existing_connection in zip(connections, existing_connections)))
+
+
+def test_get_item_index(measure, volume):
+    connections = [make_connection('Connection %d' % i, i) for i in range(volume)]
+
+    def index_and_find():
+        return [find_indexed_items('benchmark', lambda: connections, ('name', 'type'), connection)
+                for connection in connections]
+
+    matches = measure(index_and_find, setup_fn=invalidate_item_indexes)
+    assert all(len(matched) == 1 for matched in matches)
+    assert len(get_item_index('benchmark', lambda: connections, ('name', 'type'))) == volume
+
+
+def test_connection_crud_unchanged(benchmark, measure, make_module, network, volume):
+    module = make_module(get_connection_crud_argument_spec(), dict(network_href=network['href']))
+    connection = make_connection('Connection %d' % (volume // 2), volume // 2)
+
+    changed, changed_connection, _, existing_connection, diff = measure(
+        lambda: connection_crud(module, lambda: connection),
+        setup_fn=invalidate_item_indexes
+    )
+    assert changed is False
+    assert existing_connection is not None
+    assert benchmark.extra_info['requests'] <= 2
+
+
+def test_connection_crud_update(measure, make_module, network, volume):
+    module = make_module(get_connection_crud_argument_spec(), dict(network_href=network['href']))
+    descriptions = count()
+
+    def update():
+        connection = make_connection('Connection %d' % (volume // 2), volume // 2)
+        connection['description'] = 'Updated %d' % next(descriptions)
+        return connection_crud(module, lambda: connection)
+
+    changed, changed_connection, _, existing_connection, diff = measure(update)
+    assert changed is True
+    assert changed_connection['id'] == existing_connection['id']
+    assert list(diff['after'].keys()) == ['description']
+
+
+def test_connection_crud_create(measure, make_module, network):
+    module = make_module(get_connection_crud_argument_spec(), dict(network_href=network['href']))
+
+    def create():
+        return connection_crud(module, lambda: make_connection('New Connection %d' % next(__NAMES)))
+
+    changed, changed_connection, _, existing_connection, diff = measure(create)
+    assert changed is True
+    assert existing_connection is None
+
+
+def test_connections_crud_unchanged(benchmark, measure, make_module, network, volume):
+    argument_spec = get_connection_crud_argument_spec()
+    argument_spec.update(get_connections_argument_spec())
+    module = make_module(argument_spec, dict(
+        network_href=network['href'],
+        connections=[camel_dict_to_snake_dict(make_connection('Connection %d' % i, i)) for i in range(volume)]
+    ))
+
+    changed, results, diff = measure(lambda: connections_crud(module), setup_fn=invalidate_item_indexes)
+    assert changed is False
+    assert len(results) == volume
+    assert benchmark.extra_info['requests'] <= 2
+
+
+def test_find_connections(measure, make_module, network, volume):
+    argument_spec = dict()
+    argument_spec.update(get_client_argument_spec())
+    argument_spec.update(get_network_argument_spec(True))
+    argument_spec.update(get_filters_argument_spec())
+    argument_spec.update(get_listing_argument_spec())
+    module = make_module(argument_spec, dict(network_href=network['href'], fields=['id', 'name']))
+
+    def find():
+        with pytest.raises(SystemExit):
+            find_connections(module)
+
+    measure(find)